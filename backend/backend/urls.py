@@ -22,4 +22,8 @@ urlpatterns = [
     path('admin/', admin.site.urls),
     path('',views.homepage, name='home'), 
     path('whodis/',views.whodis,name='whodis'),
+    path('api/news/<str:country>/', views.news_list, name='news_list'),
+    path('api/articles/<int:article_id>/', views.article_detail, name='article_detail'),
+    path('api/search/', views.news_search, name='news_search'),
+    path('api/globe/', views.globe_snapshot, name='globe_snapshot'),
 ]
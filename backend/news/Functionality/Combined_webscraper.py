@@ -1,13 +1,26 @@
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
-from webdriver_manager.chrome import ChromeDriverManager
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, WebDriverException
-import time, json
-from supabase import create_client
-from tagging import ArticleTagger
+"""
+The scraping engine: runs any site from sites.SITES through one fetch,
+extract, tag and store path.
+
+    python Combined_webscraper.py                  # every site, one after another
+    python Combined_webscraper.py "TASS Russia"    # just one
+    python orchestrator.py                         # every site, in parallel
+"""
+import asyncio
+import sys
+from contextlib import nullcontext
+from datetime import timedelta
+from selenium.common.exceptions import WebDriverException
+from tagging import ArticleTagger, tag_in_worker
+from pipeline import Pipeline, Stage
+from driver_pool import DriverPool
+from page_load import load_page
+from db_writer import BatchWriter, article_row, canonical_url, content_hash, open_sink, row_title
+from fetching import AsyncFetcher, HttpFetcher, extract_headlines, extract_paragraphs, parse_html
+from http_cache import HttpCache
+from tag_cache import TagCache
+from sites import SITES, get_site
+from orchestrator import mark_scrape_finished, publish_globe_snapshot, sync_articles
 
 SUPABASE_URL="#"
 SUPABASE_KEY="#"
@@ -15,138 +28,258 @@ SUPABASE_KEY="#"
 
 # ----------------------------------------------------------------------
 # BROWSER
-def get_driver():
-    chrome = webdriver.Chrome(service=Service(ChromeDriverManager().install()))
-    chrome.set_page_load_timeout(30)
-    return chrome
+# Browsers come from a DriverPool that only launches Chrome on first lease,
+# so runs served entirely over HTTP never start it.
+def get_browser_pool(size=1):
+    return DriverPool(size=size, max_pages=20, warm=False)
 
 # ----------------------------------------------------------------------
-# SUPABASE
-supabase = create_client(SUPABASE_URL, SUPABASE_KEY)
+# HTTP CACHE
+# Listing pages change every few minutes; article bodies almost never do.
+LISTING_TTL = 5 * 60
+ARTICLE_TTL = 7 * 24 * 3600
 
-def clear_table(table):
-    supabase.table(table).delete().neq("id", -1).execute()
+def get_http_cache():
+    return HttpCache()
 
-def save_to_db(table, title, link, content, tags):
-    db_row = {
-        "headline": json.dumps({"title": title}),
-        "link": json.dumps({"url": link}),
-        "content": "\n\n".join(content),
-        "tags": tags
-    }
-    supabase.table(table).insert(db_row).execute()
+# Tag scores by article text, so unchanged articles aren't re-scored
+def get_tag_cache():
+    return TagCache()
 
 # ----------------------------------------------------------------------
-# MAIN SCRAPING ROUTINE
-def scrape_site(config):
-    print("\n==============================")
-    print(f"▶ Starting: {config['name']}")
-    print("==============================")
+# PAGE LOADING
+# Plain HTTP + lxml first; Selenium only for pages whose content needs JavaScript.
+# A site's "render" key can force either path: "http", "browser" or "auto" (default).
+# Both paths extract with the same CSS selectors: the browser only renders,
+# and its DOM is parsed like a fetched page.
+def rendered_document(driver):
+    return parse_html(driver.page_source, base_url=driver.current_url)
 
-    tagger = ArticleTagger()
-    clear_table(config["table"])
+def load_headlines(config, fetcher, browser):
+    limit = config.get("max_articles", 10)
 
-    driver = get_driver()
-    driver.get(config["url"])
-    time.sleep(3)
+    render = config.get("render", "auto")
+    if render != "browser":
+        doc = fetcher.get_document(config["url"], ttl=config.get("listing_ttl", LISTING_TTL))
+        headlines = extract_headlines(doc, config["headline_selectors"], limit=limit) if doc is not None else []
+        # "http" never starts a browser, even when the fetch failed
+        if headlines or render == "http":
+            if not headlines:
+                print(" ✗ no headlines over HTTP (render: http), skipping the browser")
+            return headlines
+        print(" ⚠ listing needs a browser, falling back to Selenium")
 
-    # headline list
-    headlines = config["extract_headlines"](driver)
-    print(f"✓ Found {len(headlines)} headlines")
+    with browser.lease() as driver:
+        load_page(driver, config["url"], ready_selector=config["headline_selectors"]["row"])
+        doc = rendered_document(driver)
+    return extract_headlines(doc, config["headline_selectors"], limit=limit) if doc is not None else []
 
-    results = []
+async def fetch_articles(config, headlines, cache=None):
+    """
+    Fetch article pages concurrently (per-host limits from the site config) and
+    yield (title, link, html or None) in completion order, so each article is
+    extracted and tagged as soon as it lands.
+    """
+    titles = {link: title for title, link in headlines}
+    async with AsyncFetcher(
+        concurrency=config.get("concurrency", 4),
+        rate=config.get("rate_limit"),
+        cache=cache,
+    ) as fetcher:
+        ttl = config.get("article_ttl", ARTICLE_TTL)
+        async for link, html in fetcher.iter_pages(list(titles), ttl=ttl):
+            yield titles[link], link, html
+
+def article_paragraphs(config, doc):
+    if doc is None:
+        return []
+    paragraphs = extract_paragraphs(
+        doc, config["article_selectors"], min_paragraphs=config.get("min_paragraphs", 1)
+    )
+    if not paragraphs and config.get("fallback_selector"):
+        # Last resort for unfamiliar layouts: long matches only, to skip captions and bylines
+        paragraphs = extract_paragraphs(
+            doc, [config["fallback_selector"]], longer_than=config.get("fallback_longer_than", 50)
+        )
+    return paragraphs
 
-    for idx, (title, link) in enumerate(headlines, start=1):
-        print(f"\n[{idx}] {title}")
-        driver.get(link)
-        time.sleep(2)
+def load_article_in_browser(config, browser, link):
+    with browser.lease() as driver:
+        load_page(
+            driver, link,
+            ready_selector=config["article_selectors"],
+            network_idle=config.get("network_idle", False),
+            stop_when_ready=config.get("stop_when_ready", True),
+        )
+        doc = rendered_document(driver)
+    return article_paragraphs(config, doc)
 
-        paragraphs = config["extract_article"](driver)
+# ----------------------------------------------------------------------
+# SUPABASE
+# Rows are buffered and written in batches (see db_writer.py)
+def skip_stored(config, writer, headlines):
+    """
+    Drop headlines whose article is already stored, so its page isn't fetched
+    again (unless the site sets refetch_stored, in which case unchanged
+    articles are only dropped after fetching, by content hash). Stored
+    articles still on the listing are marked seen, so expire() keeps them.
+
+    Returns:
+        tuple: (headlines still to fetch, {url_key: stored content_hash})
+    """
+    keys = {link: canonical_url(link) for _, link in headlines}
+    stored = writer.sink.stored_hashes(config["table"], set(keys.values()))
+    writer.sink.mark_seen(config["table"], stored)
+    if config.get("refetch_stored"):
+        return headlines, stored
+    return [(title, link) for title, link in headlines if keys[link] not in stored], stored
+
+# ----------------------------------------------------------------------
+# MAIN SCRAPING ROUTINE
+# Articles flow through bounded-queue stages (see pipeline.py), so pages are
+# fetched while earlier ones are still being parsed, tagged and written:
+#
+#   fetch → extract → tag → store
+#              ↘ browser ↗         (pages with no text over plain HTTP)
+def build_pipeline(config, tagger, writer, cache, browser, tag_pool, stored, results):
+    render = config.get("render", "auto")
+
+    def fetch(headlines, emit):
+        if render == "browser":
+            for title, link in headlines:
+                emit((title, link, None))
+            return
+
+        async def run():
+            async for page in fetch_articles(config, headlines, cache):
+                # emit blocks while extract is backed up; keep that off the event loop
+                await asyncio.to_thread(emit, page)
+        asyncio.run(run())
+
+    def extract(page, emit):
+        title, link, html = page
+        doc = parse_html(html, base_url=link) if html else None
+        paragraphs = article_paragraphs(config, doc)
+        if paragraphs:
+            emit((title, link, paragraphs))
+        elif render == "http":
+            print(f"\n✗ no text, skipped: {title}")
+        else:
+            emit((title, link), to=browser_stage)
+
+    def render_in_browser(headline, emit):
+        title, link = headline
+        try:
+            paragraphs = load_article_in_browser(config, browser, link)
+        except WebDriverException as e:
+            print(f"\n✗ browser error ({type(e).__name__}), skipped: {title}")
+            return
         if not paragraphs:
-            print(" ✗ no text, skipped")
-            continue
+            print(f"\n✗ no text, skipped: {title}")
+            return
+        emit((title, link, paragraphs))
 
-        tags = tagger.tag_article(paragraphs, threshold=2)
-        save_to_db(config["table"], title, link, paragraphs, tags)
-        print(f" ✓ saved → tags: {', '.join(tags)}")
+    def tag(article, emit):
+        title, link, paragraphs = article
+        if stored and stored.get(canonical_url(link)) == content_hash(paragraphs):
+            print(f"\n= unchanged, skipped: {title}")
+            return
+        if tag_pool is not None:
+            tags = tag_pool.submit(tag_in_worker, paragraphs, 2).result()
+        else:
+            tags = tagger.tag_article(paragraphs, threshold=2)
+        emit((title, link, paragraphs, tags))
 
+    def store(article, emit):
+        title, link, paragraphs, tags = article
+        writer.add(config["table"], article_row(title, link, paragraphs, tags))
+        print(f"\n✓ {title}\n  queued → tags: {', '.join(tags)}")
         results.append((title, tags, len(paragraphs)))
 
-    driver.quit()
-    return results
+    fetch_stage = Stage("fetch", fetch)
+    extract_stage = Stage("extract", extract, workers=config.get("extract_workers", 2))
+    browser_stage = Stage("browser", render_in_browser, workers=browser.size)
+    tag_stage = Stage("tag", tag, workers=config.get("tag_workers", 1))
+    store_stage = Stage("store", store)
 
-# ----------------------------------------------------------------------
-# WEBSITE-SPECIFIC SELECTORS
+    extract_stage.feeds(tag_stage, browser_stage)
+    browser_stage.feeds(tag_stage)
+    return Pipeline([fetch_stage, extract_stage, browser_stage, tag_stage, store_stage])
 
-def cnn_headlines(driver):
-    rows = driver.find_elements(By.CSS_SELECTOR, "li[data-uri]")
-    out = []
-    for i in rows:
-        try:
-            title_el = i.find_element(By.CSS_SELECTOR, ".container__headline")
-            link_el = i.find_element(By.CSS_SELECTOR, "a.container__link")
-            out.append((title_el.text.strip(), link_el.get_attribute("href")))
-        except:
-            continue
-        if len(out) == 10: break
-    return out
-
-def cnn_article(driver):
-    try:
-        body = WebDriverWait(driver, 10).until(
-            EC.presence_of_element_located((By.CSS_SELECTOR, "div.article__content"))
-        )
-        return [p.text.strip() for p in body.find_elements(By.TAG_NAME, "p") if p.text.strip()]
-    except:
-        return []
+def scrape_site(config):
+    print("\n==============================")
+    print(f"▶ Starting: {config['name']}")
+    print("==============================")
 
-def ndtv_headlines(driver):
-    rows = driver.find_elements(By.CLASS_NAME, "NwsLstPg_ttl")
-    out = []
-    for r in rows:
-        try:
-            el = r.find_element(By.CSS_SELECTOR, ".NwsLstPg_ttl-lnk")
-            out.append((el.text.strip(), el.get_attribute("href")))
-        except:
-            continue
-        if len(out) == 10: break
-    return out
-
-def ndtv_article(driver):
-    try:
-        WebDriverWait(driver, 10).until(
-            EC.presence_of_element_located((By.CLASS_NAME, "filteredParagraphs"))
-        )
-        return [
-            p.text.strip()
-            for p in driver.find_elements(By.CLASS_NAME, "filteredParagraphs")
-            if p.text.strip()
-        ]
-    except:
-        return []
+    incremental = config.get("refresh", "incremental") == "incremental"
+    # Tagging in worker processes only pays off for large sites
+    tag_workers = config.get("tag_workers", 1)
+    results = []
 
-# ----------------------------------------------------------------------
-# CONFIG REGISTRY
-SITES = [
-    {
-        "name": "CNN China",
-        "url": "https://edition.cnn.com/world/china",
-        "table": "China_news",
-        "extract_headlines": cnn_headlines,
-        "extract_article": cnn_article,
-    },
-    {
-        "name": "NDTV India",
-        "url": "https://www.ndtv.com/latest",
-        "table": "India_news",
-        "extract_headlines": ndtv_headlines,
-        "extract_article": ndtv_article,
-    }
-]
+    # Closed in reverse order on the way out, even when a stage raises;
+    # closing the writer flushes the rows still buffered, then the sink's
+    # connection is released
+    with open_sink(SUPABASE_URL, SUPABASE_KEY) as sink:
+        with BatchWriter(sink, upsert=incremental) as writer, get_tag_cache() as tag_cache:
+            tagger = ArticleTagger(cache=tag_cache)
+            with (
+                get_http_cache() as cache,
+                HttpFetcher(cache=cache) as fetcher,
+                get_browser_pool(config.get("browsers", 1)) as browser,
+                tagger.process_pool(tag_workers) if tag_workers > 1 else nullcontext() as tag_pool,
+            ):
+                if not incremental:
+                    sink.clear(config["table"])
+
+                # headline list
+                headlines = load_headlines(config, fetcher, browser)
+                print(f"✓ Found {len(headlines)} headlines")
+
+                # cheap headline-only tagging decides which article pages are worth loading
+                if config.get("wanted_tags"):
+                    headlines = tagger.prioritize_headlines(
+                        headlines, config["wanted_tags"], drop_unwanted=config.get("drop_unwanted", False)
+                    )
+                    print(f"✓ {len(headlines)} headlines after headline tagging")
+
+                stored = {}
+                if incremental:
+                    total = len(headlines)
+                    headlines, stored = skip_stored(config, writer, headlines)
+                    if config.get("refetch_stored"):
+                        print(f"✓ {len(stored)} headlines already stored, re-fetching all {total} "
+                              "to compare their content")
+                    else:
+                        print(f"✓ {total - len(headlines)} headlines already stored, {len(headlines)} to fetch")
+
+                pipeline = build_pipeline(config, tagger, writer, cache, browser, tag_pool, stored, results)
+                pipeline.run([headlines])
+                pipeline.print_metrics()
+
+                if browser.leases:
+                    print(f"✓ browser pool: {browser.stats()}")
+                print(f"✓ http cache: {cache.stats()}")
+
+        print(f"✓ database writes: {writer.stats()}")
+        if incremental:
+            sink.expire(config["table"], timedelta(hours=config.get("max_age_hours", 48)))
+    if writer.failures:
+        failed = {row_title(row) for _, row, _ in writer.failures}
+        results = [r for r in results if r[0] not in failed]
+        print(f"✗ {len(failed)} articles could not be saved")
+    return results
+
+def run_site(name):
+    """Scrape the SITES entry called `name` (used by orchestrator.py)."""
+    return scrape_site(get_site(name))
 
 # ----------------------------------------------------------------------
 # LAUNCH
+# Runs the sites one after another; orchestrator.py runs them all in parallel.
 if __name__ == "__main__":
-    for site in SITES:
+    for site in [get_site(name) for name in sys.argv[1:]] or SITES:
         results = scrape_site(site)
         print("\nDONE:", site["name"], "→", len(results), "articles stored\n")
+    sync_articles()
+    publish_globe_snapshot()
+    mark_scrape_finished()
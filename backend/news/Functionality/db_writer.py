@@ -0,0 +1,430 @@
+"""
+Buffered, batched article writes.
+
+Rows are collected per table and sent as one multi-row insert when a table's
+buffer reaches `batch_size` rows or its oldest row is `flush_interval` seconds
+old, instead of one round-trip per article. If a batch is rejected, its rows
+are retried one by one so a single bad row only fails itself, and every
+failure is kept on the writer for the caller to report.
+
+    with open_sink(url, key) as sink:
+        writer = BatchWriter(sink)
+        writer.add("USA_news", article_row(title, link, paragraphs, tags))
+        ...
+        writer.close()      # flushes what is left; the sink stays open
+        print(writer.stats())
+
+Rows carry a canonical URL key and a content hash, so a refresh can skip
+articles it already has and upsert (BatchWriter(..., upsert=True)) the ones
+that changed instead of clearing the table first.
+
+With PALLADIUM_DB=sqlite set, open_sink() returns a SQLiteSink that writes the
+same rows into backend/db.sqlite3 (the database Django uses under the same
+switch), for running the scrapers without Supabase credentials.
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime, timezone
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+# Django's Article table (news.models.Article), in the same database
+ARTICLE_TABLE = "news_article"
+
+# Query parameters that change between links to the same article
+TRACKING_PARAMS = {"fbclid", "gclid", "ref", "ref_src", "ocid", "cmpid", "ito"}
+
+
+def canonical_url(link):
+    """
+    Stable key for an article URL: lower-case host without "www.", no
+    fragment, no tracking parameters, no trailing slash.
+    """
+    parts = urlsplit(link.strip())
+    host = parts.netloc.lower()
+    if host.startswith("www."):
+        host = host[4:]
+    query = [
+        (k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+        if k.lower() not in TRACKING_PARAMS and not k.lower().startswith("utm_")
+    ]
+    path = parts.path.rstrip("/") or "/"
+    return urlunsplit(("https" if parts.scheme in ("http", "https") else parts.scheme,
+                       host, path, urlencode(sorted(query)), ""))
+
+
+def content_hash(paragraphs):
+    return hashlib.sha256("\n\n".join(paragraphs).encode("utf-8")).hexdigest()
+
+
+def article_row(title, link, paragraphs, tags):
+    """The row format the country tables and the globe frontend expect."""
+    return {
+        "headline": json.dumps({"title": title}),
+        "link": json.dumps({"url": link}),
+        "content": "\n\n".join(paragraphs),
+        "tags": tags,
+        "url_key": canonical_url(link),
+        "content_hash": content_hash(paragraphs),
+    }
+
+
+# ----------------------------------------------------------------------
+# SINKS
+# insert_many / upsert_many(table, rows) write all rows in one statement or
+# raise; upserts replace the row with the same url_key.
+# stored_hashes(table, url_keys) -> {url_key: content_hash} of stored rows.
+# list_rows(table) -> every row without its content, newest first;
+# article_ids(url_keys) -> {url_key: id} of the rows already copied into Article;
+# mark_seen(table, url_keys) records that stored rows are still listed;
+# expire(table, max_age) deletes rows neither written nor seen within the timedelta;
+# clear(table) empties the table before a full refresh;
+# close() releases the connection (also on leaving a `with` block).
+class Sink:
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class SupabaseSink(Sink):
+    """PostgREST bulk insert: one HTTP request with a JSON array body."""
+
+    def __init__(self, client):
+        self.client = client
+
+    def insert_many(self, table, rows):
+        self.client.table(table).insert(rows).execute()
+
+    def upsert_many(self, table, rows):
+        self.client.table(table).upsert(rows, on_conflict="url_key").execute()
+
+    def stored_hashes(self, table, url_keys):
+        if not url_keys:
+            return {}
+        response = (
+            self.client.table(table)
+            .select("url_key,content_hash")
+            .in_("url_key", list(url_keys))
+            .execute()
+        )
+        return {r["url_key"]: r["content_hash"] for r in response.data}
+
+    def list_rows(self, table):
+        response = (
+            self.client.table(table)
+            .select("id,created_at,headline,link,tags,url_key")
+            .order("created_at", desc=True)
+            .order("id", desc=True)
+            .execute()
+        )
+        return response.data
+
+    def article_ids(self, url_keys):
+        if not url_keys:
+            return {}
+        response = (
+            self.client.table(ARTICLE_TABLE)
+            .select("id,url_key")
+            .in_("url_key", list(url_keys))
+            .execute()
+        )
+        return {r["url_key"]: r["id"] for r in response.data}
+
+    def mark_seen(self, table, url_keys):
+        if not url_keys:
+            return
+        now = datetime.now(timezone.utc).isoformat()
+        self.client.table(table).update({"last_seen": now}).in_("url_key", list(url_keys)).execute()
+
+    def expire(self, table, max_age):
+        cutoff = (datetime.now(timezone.utc) - max_age).isoformat()
+        (
+            self.client.table(table).delete()
+            .or_(f"last_seen.lt.{cutoff},and(last_seen.is.null,created_at.lt.{cutoff})")
+            .execute()
+        )
+
+    def clear(self, table):
+        self.client.table(table).delete().neq("id", -1).execute()
+
+
+class SQLiteSink(Sink):
+    """Local stand-in for the Supabase tables (same columns, tags as JSON)."""
+
+    def __init__(self, path):
+        self.path = path
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._tables = set()
+
+    COLUMNS = ("headline", "link", "content", "tags", "url_key", "content_hash")
+
+    def _ensure_table(self, table):
+        if table in self._tables:
+            return
+        with self._conn:
+            self._conn.execute(
+                f'CREATE TABLE IF NOT EXISTS "{table}" ('
+                "id INTEGER PRIMARY KEY AUTOINCREMENT, "
+                "created_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP, "
+                "headline TEXT, link TEXT, content TEXT, tags TEXT, "
+                "url_key TEXT, content_hash TEXT, last_seen TEXT)"
+            )
+            # Tables created before url_key/content_hash/last_seen existed
+            existing = {row[1] for row in self._conn.execute(f'PRAGMA table_info("{table}")')}
+            for column in ("url_key", "content_hash", "last_seen"):
+                if column not in existing:
+                    self._conn.execute(f'ALTER TABLE "{table}" ADD COLUMN {column} TEXT')
+            self._conn.execute(
+                f'CREATE UNIQUE INDEX IF NOT EXISTS "{table}_url_key" ON "{table}" (url_key)'
+            )
+        self._tables.add(table)
+
+    def _values(self, rows):
+        return [
+            (r["headline"], r["link"], r["content"], json.dumps(r["tags"]),
+             r["url_key"], r["content_hash"])
+            for r in rows
+        ]
+
+    def insert_many(self, table, rows):
+        self._ensure_table(table)
+        with self._conn:  # one transaction: all rows or none, like PostgREST
+            self._conn.executemany(
+                f'INSERT INTO "{table}" ({", ".join(self.COLUMNS)}) VALUES (?, ?, ?, ?, ?, ?)',
+                self._values(rows),
+            )
+
+    def upsert_many(self, table, rows):
+        self._ensure_table(table)
+        updates = ", ".join(f"{c} = excluded.{c}" for c in self.COLUMNS if c != "url_key")
+        with self._conn:
+            self._conn.executemany(
+                f'INSERT INTO "{table}" ({", ".join(self.COLUMNS)}) VALUES (?, ?, ?, ?, ?, ?) '
+                f"ON CONFLICT(url_key) DO UPDATE SET {updates}",
+                self._values(rows),
+            )
+
+    def stored_hashes(self, table, url_keys):
+        self._ensure_table(table)
+        url_keys = list(url_keys)
+        if not url_keys:
+            return {}
+        placeholders = ", ".join("?" * len(url_keys))
+        return dict(self._conn.execute(
+            f'SELECT url_key, content_hash FROM "{table}" WHERE url_key IN ({placeholders})',
+            url_keys,
+        ))
+
+    def list_rows(self, table):
+        self._ensure_table(table)
+        cursor = self._conn.execute(
+            f'SELECT id, created_at, headline, link, tags, url_key FROM "{table}" '
+            "ORDER BY created_at DESC, id DESC"
+        )
+        return [
+            {"id": row_id, "created_at": created_at, "headline": headline,
+             "link": link, "tags": json.loads(tags) if tags else [], "url_key": url_key}
+            for row_id, created_at, headline, link, tags, url_key in cursor
+        ]
+
+    def article_ids(self, url_keys):
+        url_keys = list(url_keys)
+        if not url_keys:
+            return {}
+        placeholders = ", ".join("?" * len(url_keys))
+        try:
+            return dict(self._conn.execute(
+                f'SELECT url_key, id FROM "{ARTICLE_TABLE}" WHERE url_key IN ({placeholders})',
+                url_keys,
+            ))
+        except sqlite3.OperationalError:  # Django's tables not migrated yet
+            return {}
+
+    def mark_seen(self, table, url_keys):
+        self._ensure_table(table)
+        url_keys = list(url_keys)
+        if not url_keys:
+            return
+        placeholders = ", ".join("?" * len(url_keys))
+        with self._conn:
+            self._conn.execute(
+                f'UPDATE "{table}" SET last_seen = CURRENT_TIMESTAMP WHERE url_key IN ({placeholders})',
+                url_keys,
+            )
+
+    def expire(self, table, max_age):
+        self._ensure_table(table)
+        # CURRENT_TIMESTAMP format, UTC
+        cutoff = (datetime.now(timezone.utc) - max_age).strftime("%Y-%m-%d %H:%M:%S")
+        with self._conn:
+            self._conn.execute(
+                f'DELETE FROM "{table}" WHERE COALESCE(last_seen, created_at) < ?', (cutoff,)
+            )
+
+    def clear(self, table):
+        self._ensure_table(table)
+        with self._conn:
+            self._conn.execute(f'DELETE FROM "{table}"')
+
+    def close(self):
+        self._conn.close()
+
+
+LOCAL_DB = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "db.sqlite3")
+
+
+def open_sink(supabase_url, supabase_key):
+    """Supabase sink, or the local SQLite stand-in when PALLADIUM_DB=sqlite."""
+    if os.getenv("PALLADIUM_DB") == "sqlite":
+        return SQLiteSink(os.path.normpath(LOCAL_DB))
+    from supabase import create_client
+    return SupabaseSink(create_client(supabase_url, supabase_key))
+
+
+# ----------------------------------------------------------------------
+# WRITER
+class BatchWriter:
+    """
+    Thread-safe row buffer in front of a sink.
+
+    Args:
+        sink: Object with insert_many(table, rows); close() leaves it
+              open, the caller closes it (sinks are context managers)
+        batch_size (int): Flush a table once this many rows are buffered
+        flush_interval (float): Flush a table once its oldest buffered row
+                                is this many seconds old (checked by a
+                                background thread); None disables it
+        upsert (bool): Upsert on url_key instead of plain inserts
+    """
+
+    def __init__(self, sink, batch_size=25, flush_interval=2.0, upsert=False):
+        self.sink = sink
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.upsert = upsert
+
+        self._buffers = {}  # table -> (first_added, rows)
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._closed = threading.Event()
+
+        # metrics
+        self.rows_written = 0
+        self.batches = 0
+        self.failures = []  # (table, row, error message)
+
+        self._timer = None
+        if flush_interval:
+            self._timer = threading.Thread(target=self._flush_periodically, daemon=True)
+            self._timer.start()
+
+    def add(self, table, row):
+        if self._closed.is_set():
+            raise RuntimeError("BatchWriter is closed")
+        with self._lock:
+            started, rows = self._buffers.setdefault(table, (time.monotonic(), []))
+            rows.append(row)
+            full = len(rows) >= self.batch_size
+            if full:
+                del self._buffers[table]
+        if full:
+            self._write(table, rows)
+
+    def flush(self, older_than=None):
+        """Write out buffered rows (only buffers older than `older_than` seconds, if given)."""
+        now = time.monotonic()
+        with self._lock:
+            due = {
+                table: rows
+                for table, (started, rows) in self._buffers.items()
+                if older_than is None or now - started >= older_than
+            }
+            for table in due:
+                del self._buffers[table]
+        for table, rows in due.items():
+            self._write(table, rows)
+
+    def _flush_periodically(self):
+        while not self._closed.wait(self.flush_interval / 4):
+            self.flush(older_than=self.flush_interval)
+
+    def _write(self, table, rows):
+        write = self.sink.upsert_many if self.upsert else self.sink.insert_many
+        if self.upsert:
+            # Postgres refuses to upsert the same key twice in one statement
+            rows = list({row["url_key"]: row for row in rows}.values())
+
+        with self._write_lock:
+            try:
+                write(table, rows)
+                self.rows_written += len(rows)
+                self.batches += 1
+                return
+            except Exception as e:
+                print(f"    ⚠ Batch insert of {len(rows)} rows into {table} failed "
+                      f"({type(e).__name__}), retrying row by row")
+
+            # Isolate the bad rows
+            for row in rows:
+                try:
+                    write(table, [row])
+                    self.rows_written += 1
+                    self.batches += 1
+                except Exception as e:
+                    self.failures.append((table, row, f"{type(e).__name__}: {e}"))
+                    print(f"    ✗ Database error for {row_title(row)}: {e}")
+
+    def stats(self):
+        return {
+            "rows_written": self.rows_written,
+            "batches": self.batches,
+            "failed_rows": len(self.failures),
+        }
+
+    def close(self):
+        """Stop the timer and write whatever is still buffered."""
+        if self._closed.is_set():
+            return
+        self._closed.set()
+        if self._timer is not None:
+            self._timer.join()
+        self.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def row_title(row):
+    try:
+        return json.loads(row["headline"])["title"]
+    except (KeyError, TypeError, ValueError):
+        return "<untitled row>"
+
+
+def json_value(value):
+    """A headline / link column: JSON text decoded, anything else as it is."""
+    if isinstance(value, str):
+        try:
+            return json.loads(value)
+        except ValueError:
+            return value
+    return value
+
+
+def json_text(value, key):
+    """`title` / `url` out of a headline / link column (JSON text or decoded)."""
+    value = json_value(value)
+    if isinstance(value, dict):
+        return value.get(key) or ""
+    return value or ""
@@ -0,0 +1,192 @@
+import queue
+import threading
+import time
+from contextlib import contextmanager
+
+from selenium import webdriver
+from selenium.webdriver.chrome.service import Service
+from selenium.common.exceptions import WebDriverException
+from webdriver_manager.chrome import ChromeDriverManager
+
+from page_load import eager_options
+
+try:
+    import psutil
+except ImportError:  # RSS-based recycling is skipped without psutil
+    psutil = None
+
+
+def default_chrome_options():
+    """Headless, eager-loading Chrome with the memory-saving flags the scrapers use."""
+    chrome_options = eager_options()
+    chrome_options.add_argument('--headless=new')
+    chrome_options.add_argument('--disable-blink-features=AutomationControlled')
+    chrome_options.add_argument('--disable-dev-shm-usage')
+    chrome_options.add_argument('--no-sandbox')
+    chrome_options.add_argument('--disable-gpu')
+    chrome_options.add_argument('--disable-extensions')
+    chrome_options.add_argument('--disable-infobars')
+    chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
+    chrome_options.add_experimental_option('useAutomationExtension', False)
+
+    # Reduce memory usage
+    chrome_options.add_argument('--blink-settings=imagesEnabled=false')
+    return chrome_options
+
+
+class DriverPool:
+    """
+    A fixed set of warmed headless Chrome instances leased out to workers.
+
+    Each instance is recycled (quit and replaced) after `max_pages` leases or
+    once Chrome's resident memory passes `max_rss_mb`, instead of relaunching
+    the browser on a fixed schedule. The chromedriver binary is resolved once
+    per pool rather than once per browser.
+
+    Usage:
+        pool = DriverPool(size=2)
+        with pool.lease() as driver:
+            driver.get(url)
+        print(pool.stats())
+        pool.close()
+    """
+
+    def __init__(self, size=2, max_pages=20, max_rss_mb=1500, page_load_timeout=20,
+                 options_factory=default_chrome_options, warm=True):
+        """
+        Args:
+            size (int): Number of browsers kept
+            max_pages (int): Leases served by one browser before it is recycled
+                             (each lease is expected to load about one page)
+            max_rss_mb (int): Recycle a browser whose process tree uses more
+                              resident memory than this (needs psutil)
+            page_load_timeout (int): Seconds before driver.get gives up
+            options_factory (callable): Returns ChromeOptions for a new browser
+            warm (bool): Start every browser now; otherwise on first lease
+        """
+        self.size = size
+        self.max_pages = max_pages
+        self.max_rss_mb = max_rss_mb
+        self.page_load_timeout = page_load_timeout
+        self.options_factory = options_factory
+
+        self._service_path = None
+        self._idle = queue.Queue()
+        self._lock = threading.Lock()
+        self._created = 0
+        self._closed = False
+
+        # metrics
+        self.leases = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self.recycles = {"pages": 0, "rss": 0, "error": 0}
+
+        for _ in range(size):
+            self._idle.put(self._create() if warm else None)
+
+    # ------------------------------------------------------------------
+    def _create(self):
+        if self._service_path is None:
+            self._service_path = ChromeDriverManager().install()
+        driver = webdriver.Chrome(
+            service=Service(self._service_path),
+            options=self.options_factory(),
+        )
+        driver.set_page_load_timeout(self.page_load_timeout)
+        with self._lock:
+            self._created += 1
+        return {"driver": driver, "pages": 0}
+
+    def _rss_mb(self, driver):
+        """Resident memory of chromedriver plus every Chrome process under it."""
+        if psutil is None:
+            return 0
+        try:
+            root = psutil.Process(driver.service.process.pid)
+            procs = [root] + root.children(recursive=True)
+            return sum(p.memory_info().rss for p in procs) / (1024 * 1024)
+        except (psutil.Error, AttributeError):
+            return 0
+
+    def _recycle(self, slot, reason):
+        self.recycles[reason] += 1
+        try:
+            slot["driver"].quit()
+        except Exception:
+            pass
+
+    # ------------------------------------------------------------------
+    @contextmanager
+    def lease(self, timeout=None):
+        """
+        Borrow a browser for the duration of a `with` block.
+
+        A browser whose lease raised a WebDriverException is assumed broken
+        and replaced.
+        """
+        if self._closed:
+            raise RuntimeError("DriverPool is closed")
+
+        start = time.perf_counter()
+        slot = self._idle.get(timeout=timeout)
+        wait = time.perf_counter() - start
+        with self._lock:
+            self.leases += 1
+            self.total_wait += wait
+            self.max_wait = max(self.max_wait, wait)
+
+        if slot is None:
+            try:
+                slot = self._create()
+            except Exception:
+                # Hand the empty slot back so a failed launch doesn't shrink the pool
+                self._idle.put(None)
+                raise
+
+        try:
+            yield slot["driver"]
+            slot["pages"] += 1
+        except WebDriverException:
+            self._recycle(slot, "error")
+            slot = None
+            raise
+        finally:
+            if slot is not None:
+                if slot["pages"] >= self.max_pages:
+                    self._recycle(slot, "pages")
+                    slot = None
+                elif self.max_rss_mb and self._rss_mb(slot["driver"]) > self.max_rss_mb:
+                    self._recycle(slot, "rss")
+                    slot = None
+            # Recycled browsers are replaced lazily, on the next lease
+            self._idle.put(slot)
+
+    def stats(self):
+        """Lease wait times and recycle counts so far."""
+        return {
+            "leases": self.leases,
+            "avg_wait_s": self.total_wait / self.leases if self.leases else 0.0,
+            "max_wait_s": self.max_wait,
+            "browsers_started": self._created,
+            "recycles": dict(self.recycles),
+        }
+
+    def close(self):
+        self._closed = True
+        while True:
+            try:
+                slot = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            if slot is not None:
+                try:
+                    slot["driver"].quit()
+                except Exception:
+                    pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
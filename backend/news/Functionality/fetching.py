@@ -0,0 +1,274 @@
+import asyncio
+import time
+from urllib.parse import urlsplit
+
+import httpx
+from lxml import html as lxml_html
+from lxml.etree import ParserError
+
+# Browser-like headers: several publishers serve a stripped page (or a 403)
+# to clients that don't look like a browser
+DEFAULT_HEADERS = {
+    "User-Agent": (
+        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+        "(KHTML, like Gecko) Chrome/124.0 Safari/537.36"
+    ),
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+    "Accept-Language": "en-US,en;q=0.9",
+}
+
+
+# ----------------------------------------------------------------------
+# CACHING (see http_cache.py)
+# With a cache, get_html(url, ttl) returns a cached body younger than `ttl`
+# seconds without a request; otherwise it revalidates with a conditional GET.
+# ttl=None always revalidates.
+def _cached_body(cache, url, ttl):
+    """(cached entry or None, body to return without a request or None)"""
+    if cache is None:
+        return None, None
+    entry = cache.get(url)
+    if entry is not None and ttl is not None and entry["age"] < ttl:
+        cache.record("hits")
+        cache.touch(url)
+        return entry, entry["text"]
+    return entry, None
+
+
+def _cached_response(cache, url, entry, response):
+    """Body for a (possibly 304) response, updating the cache."""
+    if cache is None:
+        response.raise_for_status()
+        return response.text
+    if response.status_code == 304 and entry is not None:
+        cache.record("revalidated")
+        cache.touch(url, revalidated=True)
+        return entry["text"]
+    response.raise_for_status()
+    cache.record("misses")
+    cache.put(
+        url, response.text,
+        etag=response.headers.get("ETag"),
+        last_modified=response.headers.get("Last-Modified"),
+    )
+    return response.text
+
+
+# ----------------------------------------------------------------------
+# HTTP
+class HttpFetcher:
+    """
+    Plain-HTTP page fetcher. One client is kept for the whole run, so requests
+    to the same publisher reuse pooled keep-alive connections.
+    """
+
+    def __init__(self, timeout=15, headers=None, max_connections=20, cache=None):
+        self.cache = cache
+        self.client = httpx.Client(
+            headers=headers or DEFAULT_HEADERS,
+            timeout=timeout,
+            follow_redirects=True,
+            limits=httpx.Limits(max_connections=max_connections),
+        )
+
+    def get_html(self, url, ttl=None):
+        """Return the page's HTML, or None if it could not be fetched."""
+        entry, text = _cached_body(self.cache, url, ttl)
+        if text is not None:
+            return text
+        try:
+            response = self.client.get(url, headers=self.cache.validators(entry) if self.cache else None)
+            return _cached_response(self.cache, url, entry, response)
+        except httpx.HTTPError as e:
+            print(f"    ⚠ HTTP fetch failed ({type(e).__name__}): {url}")
+            return None
+
+    def get_document(self, url, ttl=None):
+        """Fetch and parse a page; None if fetching or parsing failed."""
+        text = self.get_html(url, ttl)
+        if text is None:
+            return None
+        return parse_html(text, base_url=url)
+
+    def close(self):
+        self.client.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+# ----------------------------------------------------------------------
+# ASYNC HTTP (many article pages at once, politely)
+class TokenBucket:
+    """Async token bucket: `rate` requests/sec on average, bursts of up to `capacity`."""
+
+    def __init__(self, rate, capacity=None):
+        self.rate = rate
+        self.capacity = capacity or max(1.0, rate)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+class AsyncFetcher:
+    """
+    Concurrent page fetcher with per-host limits: at most `concurrency`
+    requests in flight and (if `rate` is set) `rate` requests/sec per host.
+    """
+
+    def __init__(self, concurrency=4, rate=None, timeout=15, headers=None, cache=None):
+        self.concurrency = concurrency
+        self.rate = rate
+        self.cache = cache
+        self.client = httpx.AsyncClient(
+            headers=headers or DEFAULT_HEADERS,
+            timeout=timeout,
+            follow_redirects=True,
+        )
+        self._hosts = {}
+
+    def _limits(self, url):
+        host = urlsplit(url).netloc
+        if host not in self._hosts:
+            bucket = TokenBucket(self.rate) if self.rate else None
+            self._hosts[host] = (asyncio.Semaphore(self.concurrency), bucket)
+        return self._hosts[host]
+
+    async def get_html(self, url, ttl=None):
+        """Return the page's HTML, or None if it could not be fetched."""
+        # Cache reads and writes are SQLite and zlib work: they run in a
+        # thread so other downloads keep going meanwhile
+        entry = text = None
+        if self.cache is not None:
+            entry, text = await asyncio.to_thread(_cached_body, self.cache, url, ttl)
+        # Fresh cache hits skip the rate limit: nothing is sent to the host
+        if text is not None:
+            return text
+
+        semaphore, bucket = self._limits(url)
+        try:
+            async with semaphore:
+                if bucket is not None:
+                    await bucket.acquire()
+                response = await self.client.get(
+                    url, headers=self.cache.validators(entry) if self.cache else None
+                )
+            if self.cache is None:
+                return _cached_response(None, url, entry, response)
+            return await asyncio.to_thread(_cached_response, self.cache, url, entry, response)
+        except httpx.HTTPError as e:
+            print(f"    ⚠ HTTP fetch failed ({type(e).__name__}): {url}")
+            return None
+
+    async def iter_pages(self, urls, ttl=None):
+        """Yield (url, html or None) for every URL as each one finishes."""
+        async def fetch(url):
+            return url, await self.get_html(url, ttl)
+
+        tasks = [asyncio.ensure_future(fetch(url)) for url in urls]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def aclose(self):
+        await self.client.aclose()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.aclose()
+
+
+# ----------------------------------------------------------------------
+# PARSING
+def parse_html(text, base_url=None):
+    """Parse HTML into an lxml document with absolute links, or None if empty."""
+    try:
+        doc = lxml_html.fromstring(text)
+    except (ParserError, ValueError):
+        return None
+    if base_url:
+        doc.make_links_absolute(base_url, resolve_base_href=True)
+    return doc
+
+
+def element_text(el):
+    """Visible-ish text of an element, whitespace collapsed like Selenium's .text."""
+    return " ".join(el.text_content().split())
+
+
+def extract_paragraphs(doc, selectors, min_paragraphs=1, longer_than=0):
+    """
+    Run CSS selectors in order and return the first non-trivial paragraph list.
+
+    Args:
+        doc: lxml document from parse_html
+        selectors (list): CSS selectors, most specific first
+        min_paragraphs (int): Fewer matches than this falls through to the next
+        longer_than (int): Drop paragraphs of this many characters or fewer
+
+    Returns:
+        list: Paragraph strings (empty if no selector matched enough)
+    """
+    for selector in selectors:
+        paragraphs = [element_text(el) for el in doc.cssselect(selector)]
+        paragraphs = [p for p in paragraphs if len(p) > longer_than]
+        if len(paragraphs) >= min_paragraphs:
+            return paragraphs
+    return []
+
+
+def extract_headlines(doc, spec, limit=10):
+    """
+    Pull (title, link) pairs out of a listing page.
+
+    Args:
+        doc: lxml document from parse_html (links already absolute)
+        spec (dict): "row" selector for each headline block, plus optional
+                     "title" and "link" selectors inside it. A missing title
+                     or link selector means the row element itself.
+        limit (int): Stop after this many headlines
+
+    Returns:
+        list: (title, link) tuples with http(s) links
+    """
+    out = []
+    for row in doc.cssselect(spec["row"]):
+        title_el = _first(row, spec.get("title"))
+        link_el = _first(row, spec.get("link"))
+        if title_el is None or link_el is None:
+            continue
+
+        title = element_text(title_el)
+        link = link_el.get("href")
+        if title and link and link.startswith("http"):
+            out.append((title, link))
+
+        if len(out) == limit:
+            break
+    return out
+
+
+def _first(row, selector):
+    if not selector:
+        return row
+    found = row.cssselect(selector)
+    return found[0] if found else None
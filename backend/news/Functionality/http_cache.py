@@ -0,0 +1,191 @@
+import os
+import sqlite3
+import threading
+import time
+import zlib
+
+# One file next to the scrapers, whatever directory a caller runs from
+DEFAULT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "http_cache.sqlite3")
+
+# Entries looked at per eviction query
+EVICT_BATCH = 100
+
+SCHEMA = [
+    "CREATE TABLE IF NOT EXISTS pages ("
+    " url TEXT PRIMARY KEY,"
+    " body BLOB NOT NULL,"
+    " size INTEGER NOT NULL,"
+    " etag TEXT,"
+    " last_modified TEXT,"
+    " stored_at REAL NOT NULL,"
+    " accessed_at REAL NOT NULL)",
+    "CREATE INDEX IF NOT EXISTS pages_accessed_at ON pages (accessed_at)",
+    # Running total of SUM(size), one row; seeded from caches that predate it
+    "CREATE TABLE IF NOT EXISTS pages_size (id INTEGER PRIMARY KEY CHECK (id = 0), total INTEGER NOT NULL)",
+    "INSERT INTO pages_size SELECT 0, (SELECT COALESCE(SUM(size), 0) FROM pages)"
+    " WHERE NOT EXISTS (SELECT 1 FROM pages_size)",
+    "CREATE TRIGGER IF NOT EXISTS pages_size_insert AFTER INSERT ON pages BEGIN"
+    " UPDATE pages_size SET total = total + new.size; END",
+    "CREATE TRIGGER IF NOT EXISTS pages_size_update AFTER UPDATE OF size ON pages BEGIN"
+    " UPDATE pages_size SET total = total + new.size - old.size; END",
+    "CREATE TRIGGER IF NOT EXISTS pages_size_delete AFTER DELETE ON pages BEGIN"
+    " UPDATE pages_size SET total = total - old.size; END",
+]
+
+
+class HttpCache:
+    """
+    On-disk cache of fetched pages, shared by every scraper process.
+
+    Each entry keeps the (compressed) body plus the ETag / Last-Modified
+    validators the server sent. A caller passes a TTL per request: inside it
+    the cached body is used without any request; after it the fetcher sends
+    a conditional GET and a 304 reuses the body without downloading it again.
+    Least-recently-used entries are evicted once the bodies pass `max_bytes`;
+    their total size is kept up to date by triggers in the same file, so a
+    write never has to add up the whole table.
+    """
+
+    def __init__(self, path=DEFAULT_PATH, max_bytes=200 * 1024 * 1024):
+        self.path = path
+        self.max_bytes = max_bytes
+
+        # metrics, counted through record() (fetcher threads share a cache)
+        self.hits = 0          # served from cache, no request
+        self.revalidated = 0   # 304 Not Modified
+        self.misses = 0        # full download
+        self.evictions = 0
+
+        self._lock = threading.Lock()
+        self._conn = None
+
+    def _connect(self):
+        if self._conn is None:
+            self._conn = sqlite3.connect(
+                self.path, timeout=30, isolation_level=None, check_same_thread=False
+            )
+            # Several scraper processes write to the same file
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                for sql in SCHEMA:
+                    self._conn.execute(sql)
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+        return self._conn
+
+    # ------------------------------------------------------------------
+    # LOOKUPS
+    def get(self, url):
+        """
+        Cached entry for `url`, or None.
+
+        Returns:
+            dict: "text", "etag", "last_modified" and "age" (seconds since
+                  the body was stored or last revalidated)
+        """
+        with self._lock:
+            row = self._connect().execute(
+                "SELECT body, etag, last_modified, stored_at FROM pages WHERE url = ?", (url,)
+            ).fetchone()
+            if row is None:
+                return None
+            body, etag, last_modified, stored_at = row
+            return {
+                "text": zlib.decompress(body).decode("utf-8"),
+                "etag": etag,
+                "last_modified": last_modified,
+                "age": time.time() - stored_at,
+            }
+
+    def validators(self, entry):
+        """Conditional-request headers for a cached entry."""
+        headers = {}
+        if entry and entry["etag"]:
+            headers["If-None-Match"] = entry["etag"]
+        if entry and entry["last_modified"]:
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    # ------------------------------------------------------------------
+    # UPDATES
+    def put(self, url, text, etag=None, last_modified=None):
+        body = zlib.compress(text.encode("utf-8"))
+        now = time.time()
+        with self._lock:
+            # An upsert rather than INSERT OR REPLACE, whose implicit delete
+            # doesn't fire the triggers keeping the byte total
+            self._connect().execute(
+                "INSERT INTO pages"
+                " (url, body, size, etag, last_modified, stored_at, accessed_at)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?)"
+                " ON CONFLICT (url) DO UPDATE SET body = excluded.body,"
+                " size = excluded.size, etag = excluded.etag,"
+                " last_modified = excluded.last_modified,"
+                " stored_at = excluded.stored_at, accessed_at = excluded.accessed_at",
+                (url, body, len(body), etag, last_modified, now, now),
+            )
+            self._evict()
+
+    def touch(self, url, revalidated=False):
+        """Mark an entry used (and fresh again, after a 304)."""
+        now = time.time()
+        with self._lock:
+            if revalidated:
+                self._connect().execute(
+                    "UPDATE pages SET stored_at = ?, accessed_at = ? WHERE url = ?",
+                    (now, now, url),
+                )
+            else:
+                self._connect().execute(
+                    "UPDATE pages SET accessed_at = ? WHERE url = ?", (now, url)
+                )
+
+    def _evict(self):
+        conn = self._connect()
+        total = conn.execute("SELECT total FROM pages_size").fetchone()[0]
+        # Oldest-accessed first, a batch at a time, until back under the limit
+        while total > self.max_bytes:
+            batch = conn.execute(
+                "SELECT url, size FROM pages ORDER BY accessed_at LIMIT ?", (EVICT_BATCH,)
+            ).fetchall()
+            if not batch:
+                break
+            for url, size in batch:
+                conn.execute("DELETE FROM pages WHERE url = ?", (url,))
+                self.evictions += 1
+                total -= size
+                if total <= self.max_bytes:
+                    break
+
+    def record(self, outcome):
+        """Count a lookup: "hits", "revalidated" or "misses"."""
+        with self._lock:
+            setattr(self, outcome, getattr(self, outcome) + 1)
+
+    def stats(self):
+        with self._lock:
+            hits, revalidated, misses = self.hits, self.revalidated, self.misses
+            evictions = self.evictions
+        lookups = hits + revalidated + misses
+        return {
+            "hits": hits,
+            "revalidated": revalidated,
+            "misses": misses,
+            "hit_rate": (hits + revalidated) / lookups if lookups else 0.0,
+            "evictions": evictions,
+        }
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,228 @@
+"""
+Run every region's scraper at once, each in its own process.
+
+    python orchestrator.py                          # all regions
+    python orchestrator.py --concurrency 3 --timeout 300
+    python orchestrator.py --only "CNN China" --only "USA Today"
+
+A full refresh takes about as long as the slowest site instead of the sum of
+all of them. A site that crashes or hangs past its timeout is killed (with its
+browsers) without affecting the others, and one summary is printed at the end.
+Afterwards new articles are copied into the unified Article table, the globe
+snapshot (snapshot.py) is rebuilt, the news API's cache is invalidated and
+tag scores cached under older vocabularies are pruned.
+"""
+import argparse
+import importlib
+import multiprocessing
+import os
+import queue
+import signal
+import subprocess
+import sys
+import time
+
+from sites import SITES
+
+# Touched after every run; the Django news API keys its cache on its mtime
+SCRAPE_STAMP = os.path.join(os.path.dirname(os.path.abspath(__file__)), "last_scrape.stamp")
+MANAGE_PY = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "manage.py")
+
+# (name, module, function, args): one scrape_site run per registered site
+JOBS = [(site["name"], "Combined_webscraper", "run_site", (site["name"],)) for site in SITES]
+
+
+def _run_job(job, results, log_dir):
+    """Child-process entry point: run one scraper and report how it went."""
+    name, module, function, args = job
+
+    # Own process group, so a timeout can take Chrome down with us
+    if hasattr(os, "setpgrp"):
+        os.setpgrp()
+
+    if log_dir:
+        log = open(os.path.join(log_dir, f"{name.replace(' ', '_')}.log"), "w", buffering=1)
+        sys.stdout = sys.stderr = log
+
+    start = time.perf_counter()
+    try:
+        scraper = getattr(importlib.import_module(module), function)
+        stored = scraper(*args)
+        count = len(stored) if stored else 0
+        results.put((name, "ok", count, None, time.perf_counter() - start))
+    except BaseException as e:
+        results.put((name, "failed", 0, f"{type(e).__name__}: {e}", time.perf_counter() - start))
+
+
+def _drain(results, finished, wait=0):
+    """Move every reported result off the queue into `finished`."""
+    while True:
+        try:
+            row = results.get(timeout=wait) if wait else results.get_nowait()
+        except queue.Empty:
+            return
+        finished[row[0]] = row
+        wait = 0
+
+
+def _kill(process):
+    """SIGKILL a job with everything it started (Chrome), then reap it."""
+    if hasattr(os, "killpg"):
+        try:
+            # Only once the child has its own group: until setpgrp() in
+            # _run_job, its pid names no group (or, after it exits, nothing)
+            if os.getpgid(process.pid) == process.pid:
+                os.killpg(process.pid, signal.SIGKILL)
+        except (ProcessLookupError, PermissionError):
+            pass
+    # The child itself, whether or not the group kill reached it; a no-op
+    # for one that has already exited
+    process.kill()
+    process.join()
+
+
+def run_all(jobs=JOBS, concurrency=None, timeout=600, log_dir=None, poll=0.5):
+    """
+    Run jobs as independent processes, at most `concurrency` at a time.
+
+    Args:
+        jobs (list): (name, module, function, args) tuples
+        concurrency (int): Global cap on scrapers running at once
+                           (defaults to all of them)
+        timeout (int): Seconds a single site may run before it is killed
+        log_dir (str): Write each site's output to <log_dir>/<name>.log
+                       instead of interleaving it on the console
+
+    Returns:
+        list: (name, status, articles, error, seconds) per job, in job order
+    """
+    concurrency = concurrency or len(jobs)
+    if log_dir:
+        os.makedirs(log_dir, exist_ok=True)
+
+    results = multiprocessing.Queue()
+    pending = list(jobs)
+    running = {}  # name -> (process, started)
+    finished = {}
+
+    try:
+        while pending or running:
+            while pending and len(running) < concurrency:
+                job = pending.pop(0)
+                process = multiprocessing.Process(target=_run_job, args=(job, results, log_dir))
+                process.start()
+                running[job[0]] = (process, time.perf_counter())
+                print(f"▶ started {job[0]}")
+
+            time.sleep(poll)
+
+            _drain(results, finished)
+
+            for name, (process, started) in list(running.items()):
+                elapsed = time.perf_counter() - started
+                if name not in finished and not process.is_alive():
+                    # It may have exited between the drain above and now
+                    _drain(results, finished, wait=1.0)
+                if name in finished:
+                    process.join()
+                elif not process.is_alive():
+                    # Died without reporting (e.g. segfault, os._exit)
+                    finished[name] = (name, "failed", 0, f"exit code {process.exitcode}", elapsed)
+                elif elapsed > timeout:
+                    _kill(process)
+                    finished[name] = (name, "timeout", 0, f"killed after {timeout}s", elapsed)
+                else:
+                    continue
+                del running[name]
+                print(f"■ {name}: {finished[name][1]} ({elapsed:.0f}s)")
+    finally:
+        # Children run in their own process groups, out of reach of Ctrl-C,
+        # so anything still running when we leave early is killed here
+        for name, (process, _) in running.items():
+            _kill(process)
+            print(f"■ {name}: killed")
+
+    return [finished[job[0]] for job in jobs]
+
+
+def mark_scrape_finished():
+    """Invalidate the news API's cached responses."""
+    with open(SCRAPE_STAMP, "a"):
+        os.utime(SCRAPE_STAMP)
+
+
+def sync_articles():
+    """Copy the run's articles into the Article table (manage.py sync_articles)."""
+    result = subprocess.run(
+        [sys.executable, os.path.normpath(MANAGE_PY), "sync_articles"],
+        capture_output=True, text=True,
+    )
+    if result.returncode == 0:
+        print("✓ articles synced")
+    else:
+        print(f"✗ articles not synced: {result.stderr.strip().splitlines()[-1:]}")
+
+
+def publish_globe_snapshot():
+    """Rebuild the globe snapshot; a failure here doesn't fail the run."""
+    try:
+        from snapshot import publish_snapshot
+        print(f"✓ globe snapshot {publish_snapshot()}")
+    except Exception as e:
+        print(f"✗ globe snapshot not updated ({type(e).__name__}): {e}")
+
+
+def prune_tag_cache():
+    """Drop tag scores cached under older vocabularies, once per run."""
+    try:
+        from tag_cache import TagCache
+        from tagging import ArticleTagger
+        with TagCache() as cache:
+            print(f"✓ tag cache: {ArticleTagger(cache=cache).prune_cache()} stale entries pruned")
+    except Exception as e:
+        print(f"✗ tag cache not pruned ({type(e).__name__}): {e}")
+
+
+def print_summary(summary, wall_time):
+    print("\n" + "=" * 80)
+    print("SCRAPE SUMMARY")
+    print("=" * 80)
+    for name, status, count, error, elapsed in summary:
+        mark = "✗" if status != "ok" else "✓" if count else "⚠"
+        line = f"{mark} {name:<20} {status:<8} {count:>4} articles  {elapsed:7.1f}s"
+        if error:
+            line += f"  {error[:60]}"
+        print(line)
+    total = sum(row[2] for row in summary)
+    slowest = max((row[4] for row in summary), default=0)
+    print("=" * 80)
+    print(f"{total} articles from {len(summary)} sites in {wall_time:.1f}s "
+          f"(slowest site {slowest:.1f}s)")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run all region scrapers in parallel")
+    parser.add_argument("--concurrency", type=int, help="Max scrapers running at once")
+    parser.add_argument("--timeout", type=int, default=600, help="Per-site timeout in seconds")
+    parser.add_argument("--only", action="append", help="Run only this job (repeatable)")
+    parser.add_argument("--log-dir", help="Write each site's output to its own log file")
+    args = parser.parse_args(argv)
+
+    jobs = [job for job in JOBS if not args.only or job[0] in args.only]
+
+    start = time.perf_counter()
+    try:
+        summary = run_all(jobs, args.concurrency, args.timeout, args.log_dir)
+    except KeyboardInterrupt:
+        print("✗ interrupted; running scrapers were stopped")
+        return 130
+    sync_articles()
+    publish_globe_snapshot()
+    mark_scrape_finished()
+    prune_tag_cache()
+    print_summary(summary, time.perf_counter() - start)
+    return 0 if all(row[1] == "ok" for row in summary) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
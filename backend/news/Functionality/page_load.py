@@ -0,0 +1,106 @@
+import time
+
+from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import TimeoutException, WebDriverException
+
+# "eager": driver.get returns at DOMContentLoaded instead of waiting for every
+# image, ad and tracker. The article text is in the DOM by then.
+PAGE_LOAD_STRATEGY = "eager"
+
+# Number of resources the page has started fetching so far
+RESOURCE_COUNT_JS = "return performance.getEntriesByType('resource').length;"
+
+
+def eager_options(options=None):
+    """ChromeOptions (new or given) with the eager page-load strategy."""
+    options = options or Options()
+    options.page_load_strategy = PAGE_LOAD_STRATEGY
+    return options
+
+
+def wait_for_selector(driver, selectors, timeout=10):
+    """
+    Wait until any of the CSS selectors matches an element.
+
+    Returns:
+        bool: True as soon as one matches, False after `timeout` seconds
+    """
+    if isinstance(selectors, str):
+        selectors = [selectors]
+    conditions = [EC.presence_of_element_located((By.CSS_SELECTOR, s)) for s in selectors]
+    try:
+        WebDriverWait(driver, timeout).until(EC.any_of(*conditions))
+        return True
+    except TimeoutException:
+        return False
+
+
+def wait_for_network_idle(driver, idle_time=0.5, timeout=10, poll=0.1):
+    """
+    Wait until the page has started no new resource fetch for `idle_time`
+    seconds (for pages that fill their content in from XHR after load).
+
+    Returns:
+        bool: True if the network went idle before `timeout`
+    """
+    deadline = time.monotonic() + timeout
+    last_count = driver.execute_script(RESOURCE_COUNT_JS)
+    last_change = time.monotonic()
+
+    while time.monotonic() < deadline:
+        time.sleep(poll)
+        count = driver.execute_script(RESOURCE_COUNT_JS)
+        now = time.monotonic()
+        if count != last_count:
+            last_count, last_change = count, now
+        elif now - last_change >= idle_time:
+            return True
+    return False
+
+
+def stop_loading(driver):
+    try:
+        driver.execute_script("window.stop();")
+    except WebDriverException:
+        pass
+
+
+def load_page(driver, url, ready_selector=None, timeout=10, network_idle=False,
+              stop_when_ready=False):
+    """
+    Navigate to `url` and wait only as long as the page actually needs,
+    instead of a fixed sleep.
+
+    Args:
+        driver: Selenium driver (ideally created with eager_options)
+        url (str): Page to load
+        ready_selector (str or list): CSS selector(s); the page counts as ready
+                                      once any of them is present
+        timeout (int): Seconds to wait for the selector / network idle
+        network_idle (bool): Also wait for resource fetches to settle
+        stop_when_ready (bool): Call window.stop() once ready, so leftover
+                                ads and trackers stop using bandwidth and CPU
+
+    Returns:
+        bool: True if the page loaded (and the selector appeared, if given)
+    """
+    try:
+        driver.get(url)
+    except TimeoutException:
+        # Whatever made it into the DOM is often enough; stop the rest and check
+        stop_loading(driver)
+    except WebDriverException as e:
+        print(f"    ✗ Error loading page: {type(e).__name__}")
+        return False
+
+    ready = True
+    if ready_selector:
+        ready = wait_for_selector(driver, ready_selector, timeout)
+    if ready and network_idle:
+        wait_for_network_idle(driver, timeout=timeout)
+    if ready and stop_when_ready:
+        stop_loading(driver)
+    return ready
@@ -0,0 +1,190 @@
+"""
+Bounded-queue stages for the scrape path.
+
+Each Stage has its own worker threads and an inbox of limited size. Workers
+take an item, call `func(item, emit)` and pass results on with emit(); when a
+stage's inbox is full, the stage feeding it blocks, so a slow stage throttles
+the ones before it instead of letting work pile up in memory (backpressure).
+
+    fetch = Stage("fetch", fetch_page, workers=4)
+    tag = Stage("tag", tag_article, workers=2)
+    store = Stage("store", store_row)
+    pipeline = Pipeline([fetch, tag, store])     # wired in order
+    pipeline.run(headlines)
+    pipeline.print_metrics()
+
+A stage can also feed several others (Stage.feeds); it then emits to the first
+by default and to the rest with emit(item, to=stage). A stage shuts down once
+every stage feeding it has finished and its inbox is drained.
+"""
+import queue
+import threading
+import time
+
+_DONE = object()
+
+
+class Stage:
+    """
+    Args:
+        name (str): Label for logs and metrics
+        func (callable): func(item, emit) for each item; an exception only
+                         fails that item
+        workers (int): Threads running func
+        queue_size (int): Inbox capacity before producers block
+    """
+
+    def __init__(self, name, func, workers=1, queue_size=32):
+        self.name = name
+        self.func = func
+        self.workers = workers
+        self.queue_size = queue_size
+        self.inbox = queue.Queue(maxsize=queue_size)
+        self.targets = []
+
+        self._upstreams = 0
+        self._running = 0
+        self._threads = []
+        self._lock = threading.Lock()
+
+        # metrics
+        self.processed = 0
+        self.emitted = 0
+        self.errors = 0
+        self.busy = 0.0      # seconds spent inside func, summed over workers
+        self.blocked = 0.0   # seconds producers waited on a full inbox
+        self.max_depth = 0
+        self.started = None
+        self.finished = None
+
+    # ------------------------------------------------------------------
+    # WIRING
+    def feeds(self, *stages):
+        """Send this stage's output to `stages` (the first is the default)."""
+        for stage in stages:
+            self.targets.append(stage)
+            stage._upstreams += 1
+        return self
+
+    def put(self, item):
+        """Queue an item, blocking while the inbox is full."""
+        start = time.perf_counter()
+        self.inbox.put(item)
+        waited = time.perf_counter() - start
+        with self._lock:
+            self.blocked += waited
+            self.max_depth = max(self.max_depth, self.inbox.qsize())
+
+    def emit(self, item, to=None):
+        target = to or self.targets[0]
+        target.put(item)
+        with self._lock:
+            self.emitted += 1
+
+    def close(self):
+        """Called once per upstream when it finishes; the last one stops the workers."""
+        with self._lock:
+            self._upstreams -= 1
+            last = self._upstreams <= 0
+        if last:
+            for _ in range(self.workers):
+                self.inbox.put(_DONE)
+
+    # ------------------------------------------------------------------
+    # WORKERS
+    def start(self):
+        self._running = self.workers
+        for i in range(self.workers):
+            thread = threading.Thread(target=self._work, name=f"{self.name}-{i}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def _work(self):
+        while True:
+            item = self.inbox.get()
+            if item is _DONE:
+                break
+
+            start = time.perf_counter()
+            with self._lock:
+                if self.started is None:
+                    self.started = start
+            try:
+                self.func(item, self.emit)
+            except Exception as e:
+                with self._lock:
+                    self.errors += 1
+                print(f"    ⚠ {self.name} stage error ({type(e).__name__}): {e}")
+            finally:
+                with self._lock:
+                    self.busy += time.perf_counter() - start
+                    self.processed += 1
+
+        with self._lock:
+            self._running -= 1
+            last = self._running == 0
+            if last:
+                self.finished = time.perf_counter()
+        if last:
+            for target in self.targets:
+                target.close()
+
+    def join(self):
+        for thread in self._threads:
+            thread.join()
+
+    def metrics(self):
+        elapsed = (self.finished or time.perf_counter()) - self.started if self.started else 0.0
+        return {
+            "workers": self.workers,
+            "processed": self.processed,
+            "emitted": self.emitted,
+            "errors": self.errors,
+            "items_per_s": self.processed / elapsed if elapsed else 0.0,
+            "busy_s": self.busy,
+            "max_queue": self.max_depth,
+            "blocked_s": self.blocked,
+        }
+
+
+class Pipeline:
+    """
+    A set of stages fed from the first one.
+
+    Args:
+        stages (list): Stages in order; each one not yet wired with feeds()
+                       is wired to the next stage in the list
+    """
+
+    def __init__(self, stages):
+        self.stages = stages
+        for stage, following in zip(stages, stages[1:]):
+            if not stage.targets:
+                stage.feeds(following)
+        self.stages[0]._upstreams += 1  # the caller of run()
+        self.elapsed = 0.0
+
+    def run(self, items):
+        """Push `items` into the first stage and wait until every stage is done."""
+        start = time.perf_counter()
+        for stage in self.stages:
+            stage.start()
+        for item in items:
+            self.stages[0].put(item)
+        self.stages[0].close()
+        for stage in self.stages:
+            stage.join()
+        self.elapsed = time.perf_counter() - start
+
+    def metrics(self):
+        return {stage.name: stage.metrics() for stage in self.stages}
+
+    def print_metrics(self):
+        print(f"✓ pipeline finished in {self.elapsed:.1f}s")
+        for name, m in self.metrics().items():
+            print(
+                f"  {name:<8} x{m['workers']:<2} {m['processed']:>4} in {m['emitted']:>4} out "
+                f"{m['errors']:>2} errors | {m['items_per_s']:7.1f} items/s | "
+                f"busy {m['busy_s']:6.1f}s | queue max {m['max_queue']:>3} | "
+                f"producers blocked {m['blocked_s']:.1f}s"
+            )
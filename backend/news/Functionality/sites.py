@@ -0,0 +1,133 @@
+"""
+Every news source the scrapers cover, as plain config.
+
+Combined_webscraper.scrape_site runs any entry through the same fetch,
+extract, tag and store path, and orchestrator.py runs one process per entry,
+so adding a source is a new dict here.
+
+Required keys:
+    name                - unique; used by `orchestrator.py --only` and run_site
+    country             - key of news.models.COUNTRY_MODELS
+    table               - Supabase table the articles go to
+    url                 - listing page
+    headline_selectors  - "row" CSS selector for each headline block, plus
+                          optional "title" and "link" selectors inside it
+                          (missing means the row element itself)
+    article_selectors   - article body paragraph selectors, most specific
+                          first; later ones are fallbacks
+
+Optional keys:
+    min_paragraphs  - matches a body selector needs before it is used (default 1)
+    fallback_selector - used when no article selector matches enough: its matches
+                      longer than fallback_longer_than characters (default 50)
+    render          - "auto" (HTTP, browser if empty), "http" or "browser"
+    max_articles    - headlines to process (default 10)
+    concurrency     - article pages fetched at once per host (default 4)
+    extract_workers - threads parsing fetched pages (default 2)
+    tag_workers     - tagging processes; 1 (default) tags in the scraper process
+    browsers        - Chrome instances for pages that need rendering (default 1)
+    rate_limit      - max requests/sec per host (default unlimited)
+    network_idle    - in the browser, also wait for XHR-filled content to settle
+    stop_when_ready - in the browser, window.stop() once the article is present
+    wanted_tags     - tags to load article bodies for first (headline-only tagging)
+    drop_unwanted   - skip headlines tagged only with other categories
+    refresh         - "incremental" (default: upsert by URL, skip stored
+                      articles, expire old rows) or "full" (clear the table first)
+    refetch_stored  - incremental: re-fetch stored articles, upsert if changed
+    max_age_hours   - incremental: rows neither written nor still listed for this
+                      long are deleted (default 48)
+    listing_ttl     - seconds a cached listing page is used without revalidating
+    article_ttl     - the same for article pages (default a week)
+"""
+
+SITES = [
+    {
+        "name": "USA Today",
+        "country": "usa",
+        "table": "USA_news",
+        "url": "https://www.usatoday.com/news/nation/",
+        "headline_selectors": {
+            "row": "a.gnt_m_flm_a",
+        },
+        "article_selectors": ["article p"],
+        "max_articles": 10,
+        "concurrency": 4,
+        "rate_limit": 5,
+    },
+    {
+        "name": "NDTV India",
+        "country": "india",
+        "table": "India_news",
+        "url": "https://www.ndtv.com/latest",
+        "headline_selectors": {
+            "row": ".NwsLstPg_ttl",
+            "title": ".NwsLstPg_ttl-lnk",
+            "link": ".NwsLstPg_ttl-lnk",
+        },
+        "article_selectors": [
+            ".filteredParagraphs",
+            "div.sp_txt p",
+            "div.story__content p",
+            "div.story_content p",
+            "div[class*='story'] p",
+        ],
+        "min_paragraphs": 3,
+        "fallback_selector": "p",
+        "max_articles": 10,
+        "concurrency": 4,
+        "rate_limit": 5,
+    },
+    {
+        "name": "TASS Russia",
+        "country": "russia",
+        "table": "Russia_news",
+        "url": "https://tass.com",
+        "headline_selectors": {
+            "row": ".news-list__item",
+            "title": ".news-preview__title",
+            "link": "a.news-preview.news-preview_default",
+        },
+        "article_selectors": [".text-content p"],
+        "max_articles": 5,
+        "concurrency": 4,
+        "rate_limit": 5,
+    },
+    {
+        "name": "CNN China",
+        "country": "china",
+        "table": "China_news",
+        "url": "https://edition.cnn.com/world/china",
+        "headline_selectors": {
+            "row": "li[data-uri]",
+            "title": ".container__headline",
+            "link": "a.container__link",
+        },
+        "article_selectors": ["div.article__content p"],
+        "max_articles": 10,
+        "concurrency": 4,
+        "rate_limit": 5,
+    },
+    {
+        "name": "ABC Australia",
+        "country": "australia",
+        "table": "Australia_news",
+        "url": "https://www.abc.net.au/news/australia",
+        "headline_selectors": {
+            "row": "article",
+            "title": "h3",
+            "link": "a[href]",
+        },
+        "article_selectors": ["p[class^='paragraph_paragraph']"],
+        "max_articles": 5,
+        "concurrency": 4,
+        "rate_limit": 5,
+    },
+]
+
+
+def get_site(name):
+    """The SITES entry called `name`."""
+    for site in SITES:
+        if site["name"] == name:
+            return site
+    raise KeyError(f"No site named {name!r} in SITES")
@@ -0,0 +1,107 @@
+"""
+Globe snapshot: everything the globe needs on first paint, in one file.
+
+At the end of a scrape run the orchestrator summarizes every country table
+(article count, top tags, latest headlines) into snapshot/globe.json, plus
+pre-compressed globe.json.gz (and globe.json.br when the brotli package is
+installed) and globe.etag, a hash of the JSON. Django serves these files as
+they are (news.views.globe_snapshot), so the request path does no database
+work and no compression.
+
+    python snapshot.py          # rebuild it by hand
+"""
+import gzip
+import hashlib
+import json
+import os
+from collections import Counter
+
+from db_writer import json_value, open_sink
+from sites import SITES
+
+try:
+    import brotli
+except ImportError:  # .br is skipped without brotli; gzip is always written
+    brotli = None
+
+SUPABASE_URL="#"
+SUPABASE_KEY="#"
+
+SNAPSHOT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "snapshot")
+
+
+def build_snapshot(sink, sites=SITES, latest=10, top_tags=5):
+    """
+    Summarize each country's table.
+
+    Returns:
+        dict: {"countries": {country: {"count", "top_tags", "latest"}}}
+    """
+    tables = {}
+    for site in sites:
+        tables.setdefault(site["country"], site["table"])
+
+    countries = {}
+    for country, table in tables.items():
+        rows = sink.list_rows(table)
+        tag_counts = Counter(tag for row in rows for tag in (row["tags"] or []))
+        # The globe's article modal loads bodies by Article id (/api/articles/<id>/);
+        # None for rows the sync has not copied yet
+        article_ids = sink.article_ids([row["url_key"] for row in rows[:latest] if row.get("url_key")])
+        countries[country] = {
+            "count": len(rows),
+            "top_tags": tag_counts.most_common(top_tags),
+            "latest": [
+                {
+                    "id": article_ids.get(row.get("url_key")),
+                    "created_at": str(row["created_at"]),
+                    "headline": json_value(row["headline"]),
+                    "link": json_value(row["link"]),
+                    "tags": row["tags"] or [],
+                }
+                for row in rows[:latest]
+            ],
+        }
+    return {"countries": countries}
+
+
+def write_snapshot(snapshot, directory=SNAPSHOT_DIR):
+    """
+    Write globe.json, its compressed copies and globe.etag (last, so a reader
+    that sees a new ETag also sees the new bodies).
+
+    Returns:
+        str: The ETag
+    """
+    os.makedirs(directory, exist_ok=True)
+    body = json.dumps(snapshot, separators=(",", ":"), sort_keys=True).encode("utf-8")
+    etag = hashlib.sha256(body).hexdigest()[:32]
+
+    files = {
+        "globe.json": body,
+        # mtime=0 keeps the gzip bytes identical for identical content
+        "globe.json.gz": gzip.compress(body, compresslevel=9, mtime=0),
+    }
+    if brotli is not None:
+        files["globe.json.br"] = brotli.compress(body)
+    elif os.path.exists(os.path.join(directory, "globe.json.br")):
+        os.remove(os.path.join(directory, "globe.json.br"))  # would be stale
+    files["globe.etag"] = etag.encode("ascii")
+
+    for name, data in files.items():
+        path = os.path.join(directory, name)
+        tmp = f"{path}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+    return etag
+
+
+def publish_snapshot(directory=SNAPSHOT_DIR):
+    """Build the snapshot from the database and write it out."""
+    with open_sink(SUPABASE_URL, SUPABASE_KEY) as sink:
+        return write_snapshot(build_snapshot(sink), directory)
+
+
+if __name__ == "__main__":
+    print(f"✓ Wrote globe snapshot {publish_snapshot()} to {SNAPSHOT_DIR}")
@@ -0,0 +1,121 @@
+import json
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+
+# One file next to the scrapers, whatever directory a caller runs from
+DEFAULT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "tag_cache.sqlite3")
+
+
+class TagCache:
+    """
+    Persistent cache of per-tag scores, keyed by article text and vocabulary.
+
+    Scores live in an on-disk SQLite table with a size-bounded in-memory LRU in
+    front. Keys are built by ArticleTagger from a hash of the normalized text
+    plus a fingerprint of the vocabulary, so editing `tag_keywords` simply
+    stops old entries from matching; prune() deletes them, as an explicit
+    maintenance step (orchestrator.py runs it once per scrape run).
+    """
+
+    def __init__(self, path=DEFAULT_PATH, max_memory_entries=4096):
+        self.path = path
+        self.max_memory_entries = max_memory_entries
+        self.hits = 0
+        self.misses = 0
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._conn = None
+
+    # ------------------------------------------------------------------
+    # PICKLING (process-pool workers reopen their own connection)
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state["_conn"] = None
+        state["_lock"] = None
+        state["_memory"] = OrderedDict()
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def _connect(self):
+        if self._conn is None:
+            self._conn = sqlite3.connect(
+                self.path, timeout=30, isolation_level=None, check_same_thread=False
+            )
+            # Several scraper processes write to the same file, one entry per
+            # commit; a crash losing the last few entries only costs a re-score
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS tag_scores ("
+                " key TEXT PRIMARY KEY,"
+                " fingerprint TEXT NOT NULL,"
+                " scores TEXT NOT NULL)"
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS tag_scores_fingerprint"
+                " ON tag_scores (fingerprint)"
+            )
+        return self._conn
+
+    # ------------------------------------------------------------------
+    # LOOKUPS
+    def get(self, key):
+        """Return cached scores for `key`, or None on a miss."""
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                return self._memory[key]
+
+            row = self._connect().execute(
+                "SELECT scores FROM tag_scores WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+
+            self.hits += 1
+            scores = json.loads(row[0])
+            self._remember(key, scores)
+            return scores
+
+    def put(self, key, fingerprint, scores):
+        """Store scores for `key`, computed under vocabulary `fingerprint`."""
+        with self._lock:
+            self._connect().execute(
+                "INSERT OR REPLACE INTO tag_scores (key, fingerprint, scores)"
+                " VALUES (?, ?, ?)",
+                (key, fingerprint, json.dumps(scores)),
+            )
+            self._remember(key, scores)
+
+    def prune(self, fingerprint):
+        """Delete on-disk entries computed under any other vocabulary."""
+        with self._lock:
+            cursor = self._connect().execute(
+                "DELETE FROM tag_scores WHERE fingerprint != ?", (fingerprint,)
+            )
+            return cursor.rowcount
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _remember(self, key, scores):
+        self._memory[key] = scores
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_entries:
+            self._memory.popitem(last=False)
@@ -1,120 +1,699 @@
+import hashlib
+import json
+import os
+import pickle
 import re
+import sys
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from urllib.parse import urlsplit
+
+# Versioned keyword vocabulary; edit this file instead of the code
+DEFAULT_VOCABULARY = os.path.join(os.path.dirname(os.path.abspath(__file__)), "tag_vocabulary.json")
+
+# Maximal runs of word characters. Text and keywords are both split into these
+# runs; a keyword matches where its runs line up with the text's and the text
+# between them is the same as in the keyword, like `\bkeyword\b`.
+WORD_RE = re.compile(r"\w+")
+
+
+def keyword_words(keyword):
+    """
+    A vocabulary keyword as matched: lowercased with whitespace runs collapsed,
+    and its word-character runs ("covid-19" -> ("covid", "19")).
+
+    Raises:
+        ValueError: If the keyword doesn't start and end with a word
+                    character, so `\bkeyword\b` could never line up with
+                    the runs of the text (e.g. "u.s.", "#metoo", "")
+
+    Returns:
+        tuple: (normalized keyword, tuple of words)
+    """
+    normalized = " ".join(keyword.lower().split())
+    words = WORD_RE.findall(normalized)
+    if not words or not normalized.startswith(words[0]) or not normalized.endswith(words[-1]):
+        raise ValueError(
+            f"Keyword {keyword!r} must start and end with a letter or digit"
+        )
+    return normalized, tuple(words)
+
+
+def build_matcher(tag_keywords):
+    """
+    Compile a keyword vocabulary into a word-level trie.
+
+    Args:
+        tag_keywords (dict): Mapping of tag -> list of keywords
+
+    Returns:
+        dict: first word -> list of (remaining words, tag indices, keyword)
+              entries. A keyword listed under several tags (or twice under one
+              tag) carries one index per listing, so each hit scores every one.
+
+    Raises:
+        ValueError: For a keyword that can't be matched (see keyword_words)
+    """
+    tags = list(tag_keywords)
+    matcher = {}
+
+    for tag_idx, tag in enumerate(tags):
+        for keyword in tag_keywords[tag]:
+            try:
+                keyword, words = keyword_words(keyword)
+            except ValueError as e:
+                raise ValueError(f"Tag {tag!r}: {e}") from None
+            entries = matcher.setdefault(words[0], [])
+            for _, indices, listed in entries:
+                if listed == keyword:
+                    indices.append(tag_idx)
+                    break
+            else:
+                entries.append((words[1:], [tag_idx], keyword))
+
+    return matcher
+
+
+def tokenize(text):
+    """List of (word, start, end) for every word-character run in text."""
+    return [(m.group(), m.start(), m.end()) for m in WORD_RE.finditer(text)]
+
+
+def iter_matches(text, matcher, tokens=None, phrase_ends=None, min_end=0):
+    """
+    Scan lowercased text once, yielding the matcher entry of every keyword hit.
+
+    Args:
+        text (str): Lowercased article text
+        matcher (dict): Output of build_matcher
+        tokens (list): tokenize(text), if the caller already has it
+        phrase_ends (dict): Where each multi-word keyword's last hit ended;
+                            updated in place so a scan can carry on later
+        min_end (int): Only yield hits ending after this offset
+
+    Yields:
+        tuple: (remaining words, tag indices, keyword) for each occurrence
+    """
+    if tokens is None:
+        tokens = tokenize(text)
+    # Multi-word keywords are counted without overlapping themselves, like re.findall
+    if phrase_ends is None:
+        phrase_ends = {}
+
+    for i, (word, start, end) in enumerate(tokens):
+        entries = matcher.get(word)
+        if not entries:
+            continue
+
+        for entry in entries:
+            rest = entry[0]
+            hit_end = end
+            if rest:
+                keyword = entry[2]
+                if not _phrase_follows(text, tokens, i, rest, keyword):
+                    continue
+                if phrase_ends.get(keyword, -1) > start:
+                    continue
+                hit_end = phrase_ends[keyword] = tokens[i + len(rest)][2]
+
+            if hit_end > min_end:
+                yield entry
+
+
+def score_text(text, matcher, n_tags, cap=None):
+    """
+    Score lowercased text against a compiled matcher in a single pass.
+
+    Args:
+        text (str): Lowercased article text
+        matcher (dict): Output of build_matcher
+        n_tags (int): Number of tag categories in the matcher
+        cap (int): Stop counting a tag once it reaches this score, and stop
+                   scanning once every tag has; None counts everything
+
+    Returns:
+        list: Per-tag scores, in vocabulary order
+    """
+    scores = [0] * n_tags
+    if cap is None:
+        for _, indices, _ in iter_matches(text, matcher):
+            for tag_idx in indices:
+                scores[tag_idx] += 1
+        return scores
+
+    saturated = 0
+    for _, indices, _ in iter_matches(text, matcher):
+        for tag_idx in indices:
+            if scores[tag_idx] < cap:
+                scores[tag_idx] += 1
+                if scores[tag_idx] == cap:
+                    saturated += 1
+        if saturated == n_tags:
+            break
+    return scores
+
+
+def select_tags(tags, scores, threshold=2, top_k=None, with_scores=False):
+    """
+    Pick the tags whose score meets the threshold.
+
+    Args:
+        tags (list): Tag names, in vocabulary order
+        scores (list): Per-tag scores, same order
+        threshold (int): Minimum score required to assign a tag
+        top_k (int): Keep only the k highest-scoring tags (ties keep
+                     vocabulary order); None keeps all of them
+        with_scores (bool): Return (tag, score) pairs instead of names
+
+    Returns:
+        list: Assigned tags, or ["Other"] (score 0) if none qualify
+    """
+    assigned = [(tag, score) for tag, score in zip(tags, scores) if score >= threshold]
+
+    if top_k is not None:
+        assigned = sorted(assigned, key=lambda pair: pair[1], reverse=True)[:top_k]
+
+    # If no tags assigned, return "Other"
+    if not assigned:
+        assigned = [("Other", 0)]
+
+    if with_scores:
+        return assigned
+    return [tag for tag, _ in assigned]
+
+
+def vocabulary_fingerprint(tag_keywords):
+    """Short hash identifying a vocabulary; changes whenever any keyword or tag does."""
+    encoded = json.dumps(tag_keywords, ensure_ascii=False).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()[:16]
+
+
+def headline_text(title, link=None):
+    """
+    Lowercased text for headline-only tagging: the title plus the words of the
+    link's URL path, so slugs like /world/china/white-house-trade-talks count.
+    """
+    path = urlsplit(link or "").path
+    slug_words = " ".join(re.findall(r"[^\W_]+", path))
+    return f"{title or ''} {slug_words}".lower()
+
+
+def normalize_content(content):
+    """Join a list of paragraphs (or take a string) and lowercase it."""
+    if isinstance(content, list):
+        return " ".join(content).lower()
+    return content.lower()
+
+
+def _phrase_follows(text, tokens, i, rest, keyword):
+    """
+    Check that the words of `rest` follow token i, separated by the same text
+    as in `keyword` (the spaces and punctuation of "covid-19", "u.s. health").
+    """
+    last = i + len(rest)
+    if last >= len(tokens):
+        return False
+    # The span starts and ends on token boundaries, so if it equals the
+    # keyword its runs are exactly the keyword's words
+    return text[tokens[i][1]:tokens[last][2]] == keyword
+
+
+class CompiledVocabulary:
+    """
+    A vocabulary plus everything derived from it.
+
+    ArticleTagger swaps one of these in as a single attribute assignment, so a
+    reload never leaves a tagger with a matcher from one version and tags from
+    another.
+    """
+
+    def __init__(self, tag_keywords, version=None, matcher=None, fingerprint=None):
+        self.version = version
+        self.tag_keywords = tag_keywords
+        self.tags = list(tag_keywords)
+        self.matcher = matcher if matcher is not None else build_matcher(tag_keywords)
+        self.fingerprint = fingerprint or vocabulary_fingerprint(tag_keywords)
+
+    def to_artifact(self):
+        # Plain builtins only, so the pickle loads whether this module was
+        # imported as `tagging` (scrapers) or `news.Functionality.tagging` (Django)
+        return {
+            "version": self.version,
+            "tag_keywords": self.tag_keywords,
+            "matcher": self.matcher,
+            "fingerprint": self.fingerprint,
+        }
+
+
+def compiled_path(vocabulary_path):
+    """Path of the compiled artifact built from a vocabulary file."""
+    return os.path.splitext(vocabulary_path)[0] + ".pickle"
+
+
+def read_vocabulary(vocabulary_path):
+    """Parse a JSON vocabulary file into a CompiledVocabulary."""
+    with open(vocabulary_path, encoding="utf-8") as f:
+        data = json.load(f)
+    return CompiledVocabulary(data["tags"], version=data.get("version"))
+
+
+def compile_vocabulary(vocabulary_path=DEFAULT_VOCABULARY, artifact_path=None):
+    """
+    Build the serialized matcher artifact for a vocabulary file.
+
+    The artifact is written to a temporary file and renamed into place, so a
+    process reloading concurrently never reads a half-written file.
+
+    Returns:
+        str: Path of the written artifact
+    """
+    artifact_path = artifact_path or compiled_path(vocabulary_path)
+    vocabulary = read_vocabulary(vocabulary_path)
+
+    tmp_path = artifact_path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        pickle.dump(vocabulary.to_artifact(), f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_path, artifact_path)
+    return artifact_path
+
+
+def load_vocabulary(vocabulary_path=DEFAULT_VOCABULARY):
+    """
+    Load a vocabulary, from its compiled artifact when that is up to date.
+
+    Falls back to parsing and compiling the JSON file when the artifact is
+    missing or older than the vocabulary file.
+    """
+    artifact_path = compiled_path(vocabulary_path)
+    try:
+        if os.path.getmtime(artifact_path) >= os.path.getmtime(vocabulary_path):
+            with open(artifact_path, "rb") as f:
+                return CompiledVocabulary(**pickle.load(f))
+    except (OSError, pickle.UnpicklingError, EOFError, TypeError):
+        pass
+    return read_vocabulary(vocabulary_path)
+
+
+class TaggingSession:
+    """
+    Incrementally tag an article as its paragraphs arrive.
+
+    Feeding paragraphs one by one gives the same scores as tag_article on the
+    whole list, without ever building the joined text: only the last few
+    words of what has been fed are kept, so keywords spanning a paragraph
+    boundary (e.g. "white" / "house") are still found.
+
+    Usage:
+        session = tagger.session()
+        for paragraph in paragraphs:
+            session.feed(paragraph)
+        tags = session.result(threshold=2)
+    """
+
+    def __init__(self, vocabulary):
+        self.vocabulary = vocabulary
+        self.scores = [0] * len(vocabulary.tags)
+        self.paragraphs = 0
+        # A keyword of n words can start at most n - 1 words before a boundary
+        self._carry_words = max(
+            (len(rest) for entries in vocabulary.matcher.values() for rest, _, _ in entries),
+            default=0,
+        )
+        self._carry = ""
+        self._phrase_ends = {}
+
+    def feed(self, paragraph):
+        """Score one more paragraph (joined to the previous one by a space)."""
+        new_text = paragraph.lower()
+        if self.paragraphs:
+            new_text = " " + new_text
+        self.paragraphs += 1
+
+        # Rescan the carried tail with the new text, but only count hits that
+        # reach into the new text; the tail's own hits were counted already
+        text = self._carry + new_text
+        tokens = tokenize(text)
+        for _, indices, _ in iter_matches(
+            text, self.vocabulary.matcher, tokens, self._phrase_ends, min_end=len(self._carry)
+        ):
+            for tag_idx in indices:
+                self.scores[tag_idx] += 1
+
+        if self._carry_words and len(tokens) >= self._carry_words:
+            cut = tokens[-self._carry_words][1]
+        elif self._carry_words:
+            cut = 0
+        else:
+            cut = len(text)
+        self._carry = text[cut:]
+        self._phrase_ends = {key: end - cut for key, end in self._phrase_ends.items()}
+
+    def result(self, threshold=2, top_k=None, with_scores=False):
+        """Tags for everything fed so far; options as in select_tags."""
+        return select_tags(self.vocabulary.tags, self.scores, threshold, top_k, with_scores)
+
+
+# Tagger owned by each process-pool worker, set up once by _init_worker
+_worker_tagger = None
+
+
+def _init_worker(tagger):
+    global _worker_tagger
+    _worker_tagger = tagger
+
+
+def tag_in_worker(content, threshold=2):
+    """tag_article in a process_pool() worker."""
+    return _worker_tagger.tag_article(content, threshold=threshold)
+
 
 class ArticleTagger:
     """
     Automatically tags article content based on keywords and patterns.
     """
     
-    def __init__(self):
-        # Define keywords for each tag category
-        self.tag_keywords = {
-            "Political": [
-                "president", "congress", "senate", "election", "vote", "campaign",
-                "democrat", "republican", "legislation", "policy", "government",
-                "white house", "capitol", "politician", "governor", "mayor",
-                "political", "parliament", "bill", "law", "regulation"
-            ],
-            "Sports": [
-                "game", "team", "player", "coach", "score", "win", "loss",
-                "championship", "tournament", "league", "nfl", "nba", "mlb",
-                "nhl", "soccer", "football", "basketball", "baseball", "athlete",
-                "stadium", "match", "playoff", "season"
-            ],
-            "Global/International": [
-                "international", "foreign", "country", "nation", "global",
-                "world", "embassy", "diplomat", "treaty", "united nations",
-                "border", "immigrant", "refugee", "war", "conflict", "overseas",
-                "abroad", "china", "russia", "europe", "asia", "africa"
-            ],
-            "Weather": [
-                "weather", "storm", "hurricane", "tornado", "flood", "rain",
-                "snow", "temperature", "forecast", "climate", "wind", "drought",
-                "thunderstorm", "blizzard", "heatwave", "cold front", "warning",
-                "meteorologist", "precipitation", "degrees"
-            ],
-            "Science & Tech": [
-                "technology", "science", "research", "study", "scientist",
-                "innovation", "discovery", "experiment", "ai", "artificial intelligence",
-                "computer", "software", "app", "startup", "tech", "digital",
-                "internet", "cyber", "data", "algorithm", "space", "nasa"
-            ],
-            "Health": [
-                "health", "medical", "doctor", "hospital", "patient", "disease",
-                "virus", "vaccine", "medicine", "treatment", "cdc", "fda",
-                "pandemic", "epidemic", "symptom", "diagnosis", "healthcare",
-                "mental health", "therapy", "drug", "prescription"
-            ],
-            "Business/Economy": [
-                "business", "economy", "market", "stock", "company", "ceo",
-                "profit", "revenue", "financial", "investment", "trade",
-                "industry", "corporation", "banking", "wall street", "dollar",
-                "economic", "employment", "job", "unemployment", "recession"
-            ],
-            "Crime": [
-                "police", "arrest", "crime", "criminal", "investigation",
-                "suspect", "victim", "murder", "robbery", "theft", "assault",
-                "detective", "trial", "court", "lawsuit", "prison", "jail",
-                "officer", "shooting", "violence", "fbi", "charged"
-            ],
-            "Education": [
-                "school", "student", "teacher", "education", "university",
-                "college", "classroom", "learning", "degree", "academic",
-                "campus", "tuition", "graduation", "professor", "curriculum",
-                "test", "exam", "study", "scholarship"
-            ],
-            "Entertainment": [
-                "movie", "film", "actor", "actress", "music", "concert",
-                "celebrity", "hollywood", "entertainment", "show", "series",
-                "album", "song", "artist", "performance", "award", "netflix",
-                "streaming", "tv", "television", "theater"
-            ],
-            "Environment": [
-                "environment", "climate change", "pollution", "wildlife",
-                "endangered", "conservation", "ecosystem", "sustainability",
-                "carbon", "emissions", "renewable", "fossil fuel", "recycling",
-                "deforestation", "ocean", "species", "habitat", "green energy"
-            ],
-            "Disaster": [
-                "fire", "wildfire", "earthquake", "disaster", "emergency",
-                "evacuation", "rescue", "damage", "destruction", "casualties",
-                "explosion", "crash", "accident", "collapsed", "victims"
-            ]
-        }
-    
-    def tag_article(self, content, threshold=2):
+    def __init__(self, cache=None, vocabulary_path=DEFAULT_VOCABULARY):
+        """
+        Args:
+            cache (TagCache): Optional persistent score cache (see tag_cache.py)
+            vocabulary_path (str): JSON vocabulary of tag -> keywords. Its
+                                   compiled artifact is used when up to date.
+        """
+        # Optional keyword -> weight overrides for the sparse backend; unlisted
+        # keywords weigh 1. The default count backend ignores weights.
+        self.keyword_weights = {}
+
+        self.cache = cache
+        self.vocabulary_path = vocabulary_path
+        self._vocabulary_mtime = None
+        self._vocabulary = None
+        self._watcher = None
+        self._stop_watching = None
+        self.reload(force=True)
+
+    def __getstate__(self):
+        # Watcher threads stay with the process that started them
+        state = self.__dict__.copy()
+        state["_watcher"] = None
+        state["_stop_watching"] = None
+        return state
+
+    @property
+    def tag_keywords(self):
+        """Mapping of tag -> keywords currently in use."""
+        return self._vocabulary.tag_keywords
+
+    @property
+    def vocabulary_version(self):
+        return self._vocabulary.version
+
+    # ------------------------------------------------------------------
+    # VOCABULARY RELOADING
+    def reload(self, force=False):
+        """
+        Swap in the vocabulary file's current contents if it has changed.
+
+        Args:
+            force (bool): Reload even if the file's mtime is unchanged
+
+        Returns:
+            bool: True if a new vocabulary was swapped in
+        """
+        mtime = os.path.getmtime(self.vocabulary_path)
+        if not force and mtime == self._vocabulary_mtime:
+            return False
+
+        vocabulary = load_vocabulary(self.vocabulary_path)
+        self._vocabulary = vocabulary
+        self._vocabulary_mtime = mtime
+        return True
+
+    def prune_cache(self):
+        """
+        Delete cached scores from other vocabularies. They can never be
+        returned (keys include the fingerprint), only take space; this scans
+        the cache, so it runs as a maintenance step rather than on reload.
+
+        Returns:
+            int: Entries deleted
+        """
+        if self.cache is None:
+            return 0
+        return self.cache.prune(self._vocabulary.fingerprint)
+
+    def start_watching(self, interval=5.0):
+        """Poll the vocabulary file in a daemon thread and reload on change."""
+        if self._watcher is not None:
+            return
+
+        self._stop_watching = threading.Event()
+
+        def watch(stop):
+            while not stop.wait(interval):
+                try:
+                    if self.reload():
+                        print(f"✓ Reloaded tag vocabulary (version {self.vocabulary_version})")
+                except Exception as e:
+                    # A half-edited file must not kill the watcher; keep the old vocabulary
+                    print(f"✗ Tag vocabulary reload failed: {e}")
+
+        self._watcher = threading.Thread(target=watch, args=(self._stop_watching,), daemon=True)
+        self._watcher.start()
+
+    def stop_watching(self):
+        if self._watcher is None:
+            return
+        self._stop_watching.set()
+        self._watcher.join()
+        self._watcher = None
+        self._stop_watching = None
+
+    # ------------------------------------------------------------------
+    # TAGGING
+    def tag_article(self, content, threshold=2, top_k=None, early_exit=False, with_scores=False):
         """
         Tag article content based on keyword matching.
         
         Args:
             content (str or list): Article content as string or list of paragraphs
             threshold (int): Minimum keyword matches required to assign a tag
+            top_k (int): Return only the k highest-scoring tags
+            early_exit (bool): Stop counting a tag once it reaches threshold
+                               (and stop scanning once all have). Cheapest
+                               path, but scores are then capped at threshold,
+                               so top_k can no longer rank between them.
+            with_scores (bool): Return (tag, score) pairs instead of names
             
         Returns:
             list: List of tags that apply to the content
         """
         # Convert content to lowercase string
-        if isinstance(content, list):
-            text = " ".join(content).lower()
-        else:
-            text = content.lower()
-        
-        # Count keyword matches for each tag
-        tag_scores = {}
+        text = normalize_content(content)
         
-        for tag, keywords in self.tag_keywords.items():
-            score = 0
-            for keyword in keywords:
-                # Count occurrences of each keyword
-                score += len(re.findall(r'\b' + re.escape(keyword) + r'\b', text))
-            
-            tag_scores[tag] = score
+        # One vocabulary snapshot for the whole call, even if a reload swaps it
+        vocabulary = self._vocabulary
         
-        # Assign tags that meet the threshold
-        assigned_tags = [tag for tag, score in tag_scores.items() if score >= threshold]
-        
-        # If no tags assigned, return "Other"
-        if not assigned_tags:
-            assigned_tags = ["Other"]
+        # Count keyword matches for every tag in one scan of the text
+        if early_exit:
+            scores = score_text(text, vocabulary.matcher, len(vocabulary.tags), cap=threshold)
+        else:
+            scores = self._score(vocabulary, text)
         
-        return assigned_tags
-    
+        return select_tags(vocabulary.tags, scores, threshold, top_k, with_scores)
+
+    def score_article(self, content):
+        """
+        Raw keyword-match score of every tag, e.g. for ranking articles.
+
+        Returns:
+            dict: tag -> score, in vocabulary order
+        """
+        vocabulary = self._vocabulary
+        scores = self._score(vocabulary, normalize_content(content))
+        return dict(zip(vocabulary.tags, scores))
+
+    def tag_headline(self, title, link=None, threshold=1, top_k=None, with_scores=False):
+        """
+        Tag from a listing page's (title, link) alone, without the article body.
+
+        Much less text than a full article, hence the lower default threshold.
+        Options are as in tag_article.
+        """
+        vocabulary = self._vocabulary
+        scores = score_text(headline_text(title, link), vocabulary.matcher, len(vocabulary.tags))
+        return select_tags(vocabulary.tags, scores, threshold, top_k, with_scores)
+
+    def prioritize_headlines(self, headlines, wanted_tags, drop_unwanted=False, threshold=1):
+        """
+        Reorder (title, link) pairs so article pages worth loading come first.
+
+        Headlines tagged with any of `wanted_tags` come first, then ones the
+        headline alone can't classify ("Other"), then ones tagged only with
+        other categories. Order is otherwise preserved.
+
+        Args:
+            headlines (list): (title, link) pairs from a listing page
+            wanted_tags (iterable): Tags we want article bodies for
+            drop_unwanted (bool): Leave out the last group instead of demoting it
+            threshold (int): Headline tagging threshold
+
+        Returns:
+            list: (title, link) pairs
+        """
+        wanted_tags = set(wanted_tags)
+        wanted, unknown, unwanted = [], [], []
+
+        for title, link in headlines:
+            tags = self.tag_headline(title, link, threshold=threshold)
+            if wanted_tags.intersection(tags):
+                wanted.append((title, link))
+            elif tags == ["Other"]:
+                unknown.append((title, link))
+            else:
+                unwanted.append((title, link))
+
+        if drop_unwanted:
+            return wanted + unknown
+        return wanted + unknown + unwanted
+
+    def session(self):
+        """Start a TaggingSession for feeding an article paragraph by paragraph."""
+        return TaggingSession(self._vocabulary)
+
+    def _score(self, vocabulary, text):
+        """Per-tag scores for normalized text, going through the cache if set."""
+        if self.cache is None:
+            return score_text(text, vocabulary.matcher, len(vocabulary.tags))
+
+        digest = hashlib.sha256(text.encode("utf-8")).hexdigest()
+        key = f"{vocabulary.fingerprint}:{digest}"
+        scores = self.cache.get(key)
+        if scores is None:
+            scores = score_text(text, vocabulary.matcher, len(vocabulary.tags))
+            self.cache.put(key, vocabulary.fingerprint, scores)
+        return scores
+
+    def tag_many(self, articles, threshold=2, workers=None, chunksize=64, backend="count",
+                 pool=None):
+        """
+        Tag many articles, fanning the work out across worker processes.
+
+        Args:
+            articles (iterable): Articles, each a string or list of paragraphs
+            threshold (int): Minimum keyword matches required to assign a tag
+            workers (int): Number of worker processes (defaults to CPU count);
+                           1 tags everything in the current process
+            chunksize (int): Articles sent to a worker per round-trip
+            backend (str): "count" for raw keyword counts (same as tag_article),
+                           "sparse" or "tfidf" to score the whole batch with
+                           score_matrix in this process (workers is ignored)
+            pool (ProcessPoolExecutor): Open process_pool() to reuse across
+                                        calls instead of starting one per call
+                                        (workers is then ignored)
+
+        Returns:
+            list: One list of tags per article, in input order
+        """
+        if backend in ("sparse", "tfidf"):
+            vocabulary = self._vocabulary
+            scores = self.score_matrix(articles, tfidf=backend == "tfidf", vocabulary=vocabulary)
+            return [select_tags(vocabulary.tags, row, threshold) for row in scores]
+        if backend != "count":
+            raise ValueError(f"Unknown tagging backend: {backend}")
+
+        if pool is not None:
+            return list(pool.map(tag_in_worker, articles, repeat(threshold), chunksize=chunksize))
+
+        if workers is None:
+            workers = os.cpu_count() or 1
+
+        if workers <= 1:
+            return [self.tag_article(content, threshold=threshold) for content in articles]
+
+        with self.process_pool(workers) as pool:
+            return list(pool.map(
+                tag_in_worker,
+                articles,
+                repeat(threshold),
+                chunksize=chunksize,
+            ))
+
+    def process_pool(self, workers=None):
+        """
+        ProcessPoolExecutor whose workers each hold a copy of this tagger
+        (sent once, not once per article). Submit tag_in_worker to it:
+
+            with tagger.process_pool(4) as pool:
+                tags = pool.submit(tag_in_worker, paragraphs, 2).result()
+        """
+        return ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_worker,
+            initargs=(self,),
+        )
+
+    def score_matrix(self, articles, tfidf=False, vocabulary=None):
+        """
+        Score a batch of articles with one sparse matrix product.
+
+        Builds a document x keyword count matrix for the batch and multiplies
+        it by a keyword x tag weight matrix (see keyword_weights). With
+        tfidf=True, counts are scaled by each keyword's smoothed inverse
+        document frequency within the batch. Requires NumPy and SciPy.
+
+        Args:
+            articles (iterable): Articles, each a string or list of paragraphs
+            tfidf (bool): Weight keyword counts by inverse document frequency
+            vocabulary (CompiledVocabulary): Snapshot to score against
+                                             (defaults to the current one)
+
+        Returns:
+            numpy.ndarray: (articles x tags) scores, columns in vocabulary order
+        """
+        import numpy as np
+        from scipy import sparse
+
+        vocabulary = vocabulary or self._vocabulary
+        matcher = vocabulary.matcher
+
+        # One column per distinct keyword, in compilation order
+        keywords = [entry for entries in matcher.values() for entry in entries]
+        columns = {keyword: col for col, (_, _, keyword) in enumerate(keywords)}
+
+        rows, cols = [], []
+        n_docs = 0
+        for n_docs, content in enumerate(articles, start=1):
+            for _, _, keyword in iter_matches(normalize_content(content), matcher):
+                rows.append(n_docs - 1)
+                cols.append(columns[keyword])
+
+        # Duplicate (row, col) pairs are summed into counts on conversion
+        doc_term = sparse.coo_matrix(
+            (np.ones(len(rows)), (rows, cols)), shape=(n_docs, len(keywords))
+        ).tocsr()
+
+        if tfidf:
+            doc_freq = np.bincount(doc_term.indices, minlength=len(keywords))
+            idf = np.log((1 + n_docs) / (1 + doc_freq)) + 1
+            doc_term = doc_term.multiply(idf).tocsr()
+
+        weight_rows, weight_cols, weights = [], [], []
+        for col, (_, indices, keyword) in enumerate(keywords):
+            for tag_idx in indices:
+                weight_rows.append(col)
+                weight_cols.append(tag_idx)
+                weights.append(self.keyword_weights.get(keyword, 1.0))
+        keyword_tag = sparse.coo_matrix(
+            (weights, (weight_rows, weight_cols)), shape=(len(keywords), len(vocabulary.tags))
+        ).tocsr()
+
+        return (doc_term @ keyword_tag).toarray()
+
+
+# ----------------------------------------------------------------------
+# BUILD STEP: python tagging.py [vocabulary.json] -> vocabulary.pickle
+if __name__ == "__main__":
+    source = sys.argv[1] if len(sys.argv) > 1 else DEFAULT_VOCABULARY
+    artifact = compile_vocabulary(source)
+    print(f"✓ Compiled {source} → {artifact}")
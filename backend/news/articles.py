@@ -0,0 +1,134 @@
+import hashlib
+
+from django.db import connections, transaction
+
+from news.Functionality.db_writer import canonical_url, json_text
+from news.Functionality.sites import SITES
+from news.models import COUNTRY_MODELS, Article, ArticleBody, compress_body
+from news.search import index_articles
+
+
+def _write(articles, bodies, connection, using):
+    """Upsert articles, then their bodies and search index entries."""
+    Article.objects.using(using).bulk_create(
+        articles,
+        update_conflicts=True,
+        unique_fields=["url_key"],
+        update_fields=["country", "source", "link", "title", "content_hash", "tags",
+                       "scraped_at"],
+    )
+    # Ids of the upserted rows, whether inserted or updated
+    ids = dict(
+        Article.objects.using(using)
+        .filter(url_key__in=[a.url_key for a in articles])
+        .values_list("url_key", "id")
+    )
+    ArticleBody.objects.using(using).bulk_create(
+        [ArticleBody(article_id=ids[a.url_key], compressed=compress_body(bodies[a.url_key]))
+         for a in articles],
+        update_conflicts=True,
+        unique_fields=["article"],
+        update_fields=["compressed"],
+    )
+    index_articles(connection, [
+        (ids[a.url_key], a.title, bodies[a.url_key], a.country) for a in articles
+    ])
+
+
+def copy_articles(country_models, sources, using="default", page_size=500):
+    """
+    Upsert the rows of the per-country tables into Article, their compressed
+    bodies into ArticleBody, and index them for search.
+
+    Rows whose canonical URL is already there with the same link, title,
+    content hash and tags are skipped, so running it after every scrape only
+    writes new or changed articles. See sync_countries() for the
+    usual call.
+
+    Args:
+        country_models (dict): Country key -> country table model
+        sources (dict): Country key -> source name stored on its articles
+        using (str): Database alias
+        page_size (int): Rows read and written per batch
+
+    Returns:
+        dict: Country key -> number of articles written
+    """
+    connection = connections[using]
+    tables = set(connection.introspection.table_names())
+    written = {}
+
+    for country, model in country_models.items():
+        written[country] = 0
+        if model._meta.db_table not in tables:
+            continue  # never scraped into on this database
+
+        last_id = 0
+        while True:
+            page = list(
+                model.objects.using(using)
+                .filter(id__gt=last_id)
+                .order_by("id")
+                .values("id", "created_at", "headline", "link", "content", "tags",
+                        "url_key", "content_hash")[:page_size]
+            )
+            if not page:
+                break
+            last_id = page[-1]["id"]
+
+            articles, bodies = {}, {}
+            for row in page:
+                link = json_text(row["link"], "url")
+                url_key = row["url_key"] or (canonical_url(link) if link else None)
+                if not url_key:
+                    continue
+                content = row["content"] or ""
+                bodies[url_key] = content
+                articles[url_key] = Article(
+                    country=country,
+                    source=sources.get(country, ""),
+                    url_key=url_key,
+                    link=link or None,
+                    title=json_text(row["headline"], "title"),
+                    content_hash=row["content_hash"]
+                    or hashlib.sha256(content.encode("utf-8")).hexdigest(),
+                    tags=row["tags"] or [],
+                    scraped_at=row["created_at"],
+                )
+
+            # Tags change without the content (manage.py retag, vocabulary edits)
+            stored = {
+                url_key: (link, title, content_hash, tags)
+                for url_key, link, title, content_hash, tags in Article.objects.using(using)
+                .filter(url_key__in=list(articles))
+                .values_list("url_key", "link", "title", "content_hash", "tags")
+            }
+            changed = [
+                a for key, a in articles.items()
+                if stored.get(key) != (a.link, a.title, a.content_hash, a.tags)
+            ]
+            if changed:
+                with transaction.atomic(using=using):
+                    _write(changed, bodies, connection, using)
+            written[country] += len(changed)
+
+    return written
+
+
+def sync_countries(countries, using="default"):
+    """
+    copy_articles() for whole country tables, as `manage.py sync_articles`
+    and `manage.py retag` run it. A country table doesn't record its site, so
+    its articles get the name of the first site registered for the country.
+
+    Args:
+        countries (list): Country keys of COUNTRY_MODELS
+        using (str): Database alias
+
+    Returns:
+        dict: Country key -> number of articles written
+    """
+    sources = {}
+    for site in SITES:
+        sources.setdefault(site["country"], site["name"])
+    return copy_articles({c: COUNTRY_MODELS[c] for c in countries}, sources, using=using)
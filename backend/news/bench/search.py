@@ -0,0 +1,181 @@
+"""
+Search latency benchmark.
+
+Builds a local SQLite database of synthetic articles (titles and bodies made
+from the tagger corpus and its vocabulary) with compressed bodies and the FTS5
+index, then times news.search.search_articles for a mix of queries and fails
+if the p95 latency is over budget.
+
+Run from the backend/ directory:
+    python -m news.bench.search                       # 1M articles, 50 ms budget
+    python -m news.bench.search --articles 100000 --repeat 20
+    python -m news.bench.search --rebuild             # regenerate the database
+
+The database is kept (by default in the temp directory) and reused while it
+holds the requested number of articles, since building 1M rows takes minutes.
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "backend.settings")
+
+import django  # noqa: E402
+from django.conf import settings  # noqa: E402
+
+DEFAULT_DB = os.path.join(tempfile.gettempdir(), "palladium_search_bench.sqlite3")
+COUNTRIES = ["usa", "india", "russia", "china", "australia"]
+
+
+def setup_django(path):
+    """Point the default database at the benchmark file before connecting."""
+    settings.DATABASES["default"] = {"ENGINE": "django.db.backends.sqlite3", "NAME": path}
+    django.setup()
+
+
+# ----------------------------------------------------------------------
+# DATABASE
+def article_count():
+    from django.db import connection
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT COUNT(*) FROM news_article")
+            return cursor.fetchone()[0]
+    except Exception:
+        return 0
+
+
+def build_database(path, n_articles, seed=2310):
+    """Create a fresh migrated database with `n_articles` synthetic articles."""
+    from django.core.management import call_command
+    from django.db import connection, transaction
+
+    from news.bench.tagging import FILLER, load_corpus
+    from news.Functionality.tagging import ArticleTagger
+
+    connection.close()
+    for suffix in ("", "-wal", "-shm"):
+        if os.path.exists(path + suffix):
+            os.remove(path + suffix)
+    call_command("migrate", "news", verbosity=0)
+
+    rng = random.Random(seed)
+    paragraphs = [p for article in load_corpus() for p in article["paragraphs"]]
+    keywords = [k for ks in ArticleTagger().tag_keywords.values() for k in ks]
+
+    start = time.perf_counter()
+    batch = []
+    with connection.cursor() as cursor, transaction.atomic():
+        for article_id in range(1, n_articles + 1):
+            title = " ".join(
+                rng.choice(keywords) if rng.random() < 0.3 else rng.choice(FILLER)
+                for _ in range(rng.randint(6, 12))
+            ).capitalize()
+            batch.append((
+                article_id, rng.choice(COUNTRIES), "bench", f"https://bench.local/{article_id}",
+                title, rng.choice(paragraphs), json.dumps(rng.sample(COUNTRIES, 1)),
+                f"2026-01-01 00:{article_id % 60:02d}:00",
+            ))
+            if len(batch) == 10000:
+                _insert(connection, cursor, batch)
+                batch = []
+                print(f"\r  {article_id:,} articles", end="", flush=True)
+        _insert(connection, cursor, batch)
+    with connection.cursor() as cursor:
+        cursor.execute("INSERT INTO news_article_fts (news_article_fts) VALUES ('optimize')")
+    print(f"\r✓ Built {n_articles:,} articles in {time.perf_counter() - start:.0f}s")
+
+
+def _insert(connection, cursor, rows):
+    """rows: (id, country, source, url_key, title, content, tags, scraped_at)"""
+    from news.models import compress_body
+    from news.search import index_articles
+
+    cursor.executemany(
+        "INSERT INTO news_article (id, country, source, url_key, title, "
+        "content_hash, tags, scraped_at) VALUES (%s, %s, %s, %s, %s, '', %s, %s)",
+        [row[:5] + row[6:] for row in rows],
+    )
+    cursor.executemany(
+        "INSERT INTO news_articlebody (article_id, compressed) VALUES (%s, %s)",
+        [(row[0], compress_body(row[5])) for row in rows],
+    )
+    index_articles(connection, [(row[0], row[4], row[5], row[1]) for row in rows])
+
+
+# ----------------------------------------------------------------------
+# QUERIES
+def make_queries(n, seed=7):
+    """(label, query, country) samples: rare, common and multi-word terms."""
+    from news.bench.tagging import FILLER
+    from news.Functionality.tagging import ArticleTagger
+
+    rng = random.Random(seed)
+    keywords = [k for ks in ArticleTagger().tag_keywords.values() for k in ks if " " not in k]
+    queries = []
+    for _ in range(n):
+        queries.append(("keyword", rng.choice(keywords), None))
+        queries.append(("two keywords", f"{rng.choice(keywords)} {rng.choice(keywords)}", None))
+        queries.append(("keyword+country", rng.choice(keywords), rng.choice(COUNTRIES)))
+        queries.append(("common word", rng.choice(FILLER), None))
+    return queries
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def bench(queries, repeat, limit):
+    from news.search import search_articles
+
+    latencies = {}
+    for _ in range(repeat):
+        for label, query, country in queries:
+            start = time.perf_counter()
+            search_articles(query, country, limit=limit)
+            latencies.setdefault(label, []).append(time.perf_counter() - start)
+    return latencies
+
+
+# ----------------------------------------------------------------------
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--articles", type=int, default=1_000_000, help="Articles in the database")
+    parser.add_argument("--db", default=DEFAULT_DB, help="Benchmark database file")
+    parser.add_argument("--rebuild", action="store_true", help="Regenerate the database")
+    parser.add_argument("--queries", type=int, default=25, help="Queries of each kind")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed passes over the queries")
+    parser.add_argument("--limit", type=int, default=10, help="Results per page")
+    parser.add_argument("--budget-ms", type=float, default=50.0, help="Maximum p95 latency")
+    args = parser.parse_args(argv)
+
+    setup_django(args.db)
+    if args.rebuild or article_count() != args.articles:
+        build_database(args.db, args.articles)
+    print(f"Database: {args.db} ({article_count():,} articles)")
+
+    queries = make_queries(args.queries)
+    bench(queries, 1, args.limit)  # warm the page cache
+    latencies = bench(queries, args.repeat, args.limit)
+
+    ok = True
+    for label, values in latencies.items():
+        p95 = percentile(values, 95) * 1e3
+        mark = "✓" if p95 <= args.budget_ms else "✗"
+        ok = ok and p95 <= args.budget_ms
+        print(f"  {mark} {label:<16} p50 {percentile(values, 50) * 1e3:6.2f} ms | "
+              f"p95 {p95:6.2f} ms | max {max(values) * 1e3:6.2f} ms")
+    all_values = [v for values in latencies.values() for v in values]
+    print(f"  overall p95 {percentile(all_values, 95) * 1e3:.2f} ms "
+          f"(budget {args.budget_ms:.0f} ms)")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,229 @@
+"""
+Tagger micro-benchmark and regression check.
+
+Runs ArticleTagger over the checked-in corpus (corpus.jsonl.gz), reports
+throughput, per-article latency percentiles and peak memory, and fails if any
+article's tags differ from golden_tags.json.
+
+Run from the backend/ directory:
+    python -m news.bench.tagging                    # all modes
+    python -m news.bench.tagging --mode article --repeat 5
+    python -m news.bench.tagging --update-golden    # after an intended tag change
+    python -m news.bench.tagging --make-corpus      # regenerate the corpus
+
+The corpus is synthetic (generated by --make-corpus from filler words and the
+tag vocabulary) so it can be shipped with the repo; saved real article texts
+in the same {"id", "source", "paragraphs"} format can be appended to it.
+"""
+import argparse
+import gzip
+import json
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+from news.Functionality.tagging import ArticleTagger
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+CORPUS_PATH = os.path.join(BENCH_DIR, "corpus.jsonl.gz")
+GOLDEN_PATH = os.path.join(BENCH_DIR, "golden_tags.json")
+
+THRESHOLD = 2
+MODES = ["article", "early-exit", "session", "sparse"]
+
+
+# ----------------------------------------------------------------------
+# CORPUS
+def load_corpus(path=CORPUS_PATH):
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+FILLER = (
+    "the a an and or but of to in on at for with from by about after before "
+    "over under between during said says told officials people year years day "
+    "week month new first last local city state region report reports according "
+    "statement people's public many several some other more most while since "
+    "also however meanwhile earlier later recently still already just only "
+    "would could should will may might has have had been was were is are be "
+    "this that these those its their his her our one two three four five ten "
+    "percent million billion number group members plan plans time part case "
+    "area areas family families home homes told reporters spokesperson added "
+    "called expected continue continued move moved long short high low large "
+    "small major minor key main early late next previous official officials"
+).split()
+
+SOURCES = ["NDTV India", "TASS Russia", "CNN China", "USA Today", "ABC Australia"]
+
+
+def make_corpus(path=CORPUS_PATH, n_articles=300, seed=2310):
+    """Write a deterministic synthetic corpus of topical articles."""
+    rng = random.Random(seed)
+    tag_keywords = ArticleTagger().tag_keywords
+    all_keywords = [k for keywords in tag_keywords.values() for k in keywords]
+    tags = list(tag_keywords)
+
+    with gzip.open(path, "wt", encoding="utf-8") as f:
+        for article_id in range(n_articles):
+            topics = rng.sample(tags, rng.choice([1, 1, 2, 2, 3]))
+            # Mostly news-length articles, with a tail of long live blogs
+            n_paragraphs = rng.choice([rng.randint(3, 15)] * 9 + [rng.randint(40, 120)])
+
+            paragraphs = []
+            for _ in range(n_paragraphs):
+                words = []
+                for _ in range(rng.randint(25, 90)):
+                    roll = rng.random()
+                    if roll < 0.03:
+                        words.append(rng.choice(tag_keywords[rng.choice(topics)]))
+                    elif roll < 0.035:
+                        words.append(rng.choice(all_keywords))
+                    else:
+                        words.append(rng.choice(FILLER))
+                sentence = " ".join(words)
+                paragraphs.append(sentence[0].upper() + sentence[1:] + ".")
+
+            record = {
+                "id": article_id,
+                "source": rng.choice(SOURCES),
+                "paragraphs": paragraphs,
+            }
+            f.write(json.dumps(record) + "\n")
+
+
+# ----------------------------------------------------------------------
+# MODES (each takes the corpus and returns one tag list per article)
+def run_mode(tagger, mode, corpus, latencies=None):
+    if mode == "sparse":
+        # Batch backend: one latency sample for the whole corpus
+        start = time.perf_counter()
+        results = tagger.tag_many([a["paragraphs"] for a in corpus], THRESHOLD, backend="sparse")
+        if latencies is not None:
+            latencies.append((time.perf_counter() - start) / max(len(corpus), 1))
+        return results
+
+    results = []
+    for article in corpus:
+        start = time.perf_counter()
+        if mode == "article":
+            tags = tagger.tag_article(article["paragraphs"], threshold=THRESHOLD)
+        elif mode == "early-exit":
+            tags = tagger.tag_article(article["paragraphs"], threshold=THRESHOLD, early_exit=True)
+        else:
+            session = tagger.session()
+            for paragraph in article["paragraphs"]:
+                session.feed(paragraph)
+            tags = session.result(threshold=THRESHOLD)
+        if latencies is not None:
+            latencies.append(time.perf_counter() - start)
+        results.append(tags)
+    return results
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def bench_mode(tagger, mode, corpus, repeat):
+    total_chars = sum(len(p) for a in corpus for p in a["paragraphs"])
+
+    # Warm-up pass (also the correctness sample)
+    results = run_mode(tagger, mode, corpus)
+
+    latencies = []
+    start = time.perf_counter()
+    for _ in range(repeat):
+        run_mode(tagger, mode, corpus, latencies)
+    elapsed = time.perf_counter() - start
+
+    # Separate pass for memory: tracemalloc slows everything down
+    tracemalloc.start()
+    run_mode(tagger, mode, corpus)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    articles = len(corpus) * repeat
+    print(f"\n▶ {mode}")
+    print(f"  throughput : {articles / elapsed:,.0f} articles/sec "
+          f"({total_chars * repeat / elapsed / 1e6:.1f} MB/sec of text)")
+    print(f"  latency    : p50 {percentile(latencies, 50) * 1e3:.3f} ms | "
+          f"p90 {percentile(latencies, 90) * 1e3:.3f} ms | "
+          f"p99 {percentile(latencies, 99) * 1e3:.3f} ms | "
+          f"max {max(latencies) * 1e3:.3f} ms")
+    print(f"  peak memory: {peak / 1024:,.0f} KiB")
+    return results
+
+
+# ----------------------------------------------------------------------
+# GOLDEN FILE
+def check_golden(corpus, results):
+    with open(GOLDEN_PATH, encoding="utf-8") as f:
+        golden = json.load(f)
+
+    mismatches = [
+        (article["id"], golden.get(str(article["id"])), tags)
+        for article, tags in zip(corpus, results)
+        if golden.get(str(article["id"])) != tags
+    ]
+    if mismatches:
+        print(f"  ✗ {len(mismatches)} articles differ from the golden tags:")
+        for article_id, expected, actual in mismatches[:10]:
+            print(f"    [{article_id}] expected {expected}, got {actual}")
+    else:
+        print(f"  ✓ tags match golden file ({len(corpus)} articles)")
+    return not mismatches
+
+
+def write_golden(corpus, results):
+    golden = {str(article["id"]): tags for article, tags in zip(corpus, results)}
+    with open(GOLDEN_PATH, "w", encoding="utf-8") as f:
+        json.dump(golden, f, indent=1)
+        f.write("\n")
+
+
+# ----------------------------------------------------------------------
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--mode", action="append", choices=MODES,
+                        help="Mode to benchmark (repeatable, defaults to all)")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed passes over the corpus")
+    parser.add_argument("--update-golden", action="store_true",
+                        help="Rewrite golden_tags.json from the article mode")
+    parser.add_argument("--make-corpus", action="store_true",
+                        help="Regenerate the synthetic corpus")
+    args = parser.parse_args(argv)
+
+    if args.make_corpus:
+        make_corpus()
+        print(f"✓ Wrote {CORPUS_PATH}")
+
+    tagger = ArticleTagger()
+    corpus = load_corpus()
+    print(f"Corpus: {len(corpus)} articles, "
+          f"{sum(len(a['paragraphs']) for a in corpus)} paragraphs")
+
+    if args.update_golden:
+        write_golden(corpus, run_mode(tagger, "article", corpus))
+        print(f"✓ Wrote {GOLDEN_PATH}")
+        return 0
+
+    ok = True
+    for mode in args.mode or MODES:
+        if mode == "sparse":
+            try:
+                import numpy, scipy  # noqa: F401
+            except ImportError:
+                print("\n▶ sparse\n  skipped (needs NumPy and SciPy)")
+                continue
+        results = bench_mode(tagger, mode, corpus, args.repeat)
+        ok = check_golden(corpus, results) and ok
+
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,116 @@
+import os
+import time
+from contextlib import nullcontext
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+from news.articles import sync_countries
+from news.models import COUNTRY_MODELS
+from news.Functionality.tag_cache import TagCache
+from news.Functionality.tagging import ArticleTagger
+
+
+class Command(BaseCommand):
+    help = (
+        "Re-run ArticleTagger over the stored content of the country news "
+        "tables, write back only the rows whose tags changed and copy them "
+        "into the Article table."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--country", action="append", choices=list(COUNTRY_MODELS),
+            help="Country table to re-tag (repeatable, defaults to all)",
+        )
+        parser.add_argument("--page-size", type=int, default=1000,
+                            help="Rows fetched per keyset page")
+        parser.add_argument("--threshold", type=int, default=2,
+                            help="Minimum keyword matches required to assign a tag")
+        parser.add_argument("--workers", type=int, default=1,
+                            help="Tagging processes, shared by all pages")
+        parser.add_argument("--dry-run", action="store_true",
+                            help="Count changed rows without writing them")
+
+    def handle(self, *args, **options):
+        with TagCache() as cache:
+            self.retag(ArticleTagger(cache=cache), options)
+
+    def retag(self, tagger, options):
+        countries = options["country"] or list(COUNTRY_MODELS)
+        tables = set(connection.introspection.table_names())
+        retagged = []
+
+        # One pool for the whole run; starting workers costs more than a page
+        workers = options["workers"]
+        with tagger.process_pool(workers) if workers > 1 else nullcontext() as pool:
+            for country in countries:
+                model = COUNTRY_MODELS[country]
+                if model._meta.db_table not in tables:
+                    self.stdout.write(f"{model._meta.db_table}: no such table, skipped")
+                    continue
+                scanned, changed, elapsed = self.retag_table(model, tagger, pool, options)
+                rate = scanned / elapsed if elapsed else 0.0
+                self.stdout.write(
+                    f"{model._meta.db_table}: {scanned} rows scanned, "
+                    f"{changed} updated in {elapsed:.1f}s ({rate:.0f} rows/sec)"
+                )
+                if changed:
+                    retagged.append(country)
+
+        if retagged and not options["dry_run"]:
+            self.publish(retagged)
+
+        # Retagging follows vocabulary edits: scores under the old one are dead
+        if not options["dry_run"]:
+            self.stdout.write(f"Tag cache: {tagger.prune_cache()} stale entries pruned")
+
+    def publish(self, countries):
+        """Copy the new tags into Article and invalidate the news API cache."""
+        written = sync_countries(countries)
+        self.stdout.write(f"Article: {sum(written.values())} articles updated")
+
+        with open(settings.NEWS_SCRAPE_STAMP, "a"):
+            os.utime(settings.NEWS_SCRAPE_STAMP)
+
+    def retag_table(self, model, tagger, pool, options):
+        """
+        Stream one table in id order and bulk-update rows whose tags changed.
+
+        Returns:
+            tuple: (rows scanned, rows changed, seconds elapsed)
+        """
+        start = time.perf_counter()
+        scanned = changed = 0
+        last_id = 0
+
+        while True:
+            # Keyset pagination: constant cost per page, unlike OFFSET
+            page = list(
+                model.objects.filter(id__gt=last_id)
+                .order_by("id")
+                .only("id", "content", "tags")[:options["page_size"]]
+            )
+            if not page:
+                break
+            last_id = page[-1].id
+            scanned += len(page)
+
+            # Scrapers store paragraphs joined by blank lines; split them back
+            contents = [(row.content or "").split("\n\n") for row in page]
+            new_tags = tagger.tag_many(
+                contents, threshold=options["threshold"], workers=1, pool=pool
+            )
+
+            updates = []
+            for row, tags in zip(page, new_tags):
+                if row.tags != tags:
+                    row.tags = tags
+                    updates.append(row)
+
+            changed += len(updates)
+            if updates and not options["dry_run"]:
+                model.objects.bulk_update(updates, ["tags"])
+
+        return scanned, changed, time.perf_counter() - start
@@ -0,0 +1,27 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from news.articles import sync_countries
+from news.models import COUNTRY_MODELS
+
+
+class Command(BaseCommand):
+    help = (
+        "Copy new and changed rows of the country news tables into the "
+        "unified Article table (orchestrator.py runs this after each scrape)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--country", action="append", choices=list(COUNTRY_MODELS),
+            help="Country table to copy (repeatable, defaults to all)",
+        )
+
+    def handle(self, *args, **options):
+        countries = options["country"] or list(COUNTRY_MODELS)
+        start = time.perf_counter()
+        written = sync_countries(countries)
+        for country, count in written.items():
+            self.stdout.write(f"{COUNTRY_MODELS[country]._meta.db_table}: {count} articles written")
+        self.stdout.write(f"Synced in {time.perf_counter() - start:.1f}s")
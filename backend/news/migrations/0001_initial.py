@@ -0,0 +1,119 @@
+# Generated by Django 5.2.18 on 2026-10-18 18:40
+
+import django.utils.timezone
+import news.models
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AustraliaNews',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('headline', models.JSONField(blank=True, null=True)),
+                ('link', models.JSONField(blank=True, null=True)),
+                ('content', models.TextField(blank=True, null=True)),
+                ('tags', news.models.TagsField(blank=True, null=True)),
+                ('url_key', models.TextField(blank=True, null=True, unique=True)),
+                ('content_hash', models.CharField(blank=True, max_length=64, null=True)),
+            ],
+            options={
+                'db_table': 'Australia_news',
+                'managed': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='ChinaNews',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('headline', models.JSONField(blank=True, null=True)),
+                ('link', models.JSONField(blank=True, null=True)),
+                ('content', models.TextField(blank=True, null=True)),
+                ('tags', news.models.TagsField(blank=True, null=True)),
+                ('url_key', models.TextField(blank=True, null=True, unique=True)),
+                ('content_hash', models.CharField(blank=True, max_length=64, null=True)),
+            ],
+            options={
+                'db_table': 'China_news',
+                'managed': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='IndiaNews',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('headline', models.JSONField(blank=True, null=True)),
+                ('link', models.JSONField(blank=True, null=True)),
+                ('content', models.TextField(blank=True, null=True)),
+                ('tags', news.models.TagsField(blank=True, null=True)),
+                ('url_key', models.TextField(blank=True, null=True, unique=True)),
+                ('content_hash', models.CharField(blank=True, max_length=64, null=True)),
+            ],
+            options={
+                'db_table': 'India_news',
+                'managed': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='RussiaNews',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('headline', models.JSONField(blank=True, null=True)),
+                ('link', models.JSONField(blank=True, null=True)),
+                ('content', models.TextField(blank=True, null=True)),
+                ('tags', news.models.TagsField(blank=True, null=True)),
+                ('url_key', models.TextField(blank=True, null=True, unique=True)),
+                ('content_hash', models.CharField(blank=True, max_length=64, null=True)),
+            ],
+            options={
+                'db_table': 'Russia_news',
+                'managed': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='USANews',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('headline', models.JSONField(blank=True, null=True)),
+                ('link', models.JSONField(blank=True, null=True)),
+                ('content', models.TextField(blank=True, null=True)),
+                ('tags', news.models.TagsField(blank=True, null=True)),
+                ('url_key', models.TextField(blank=True, null=True, unique=True)),
+                ('content_hash', models.CharField(blank=True, max_length=64, null=True)),
+            ],
+            options={
+                'db_table': 'USA_news',
+                'managed': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='Article',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('country', models.CharField(max_length=16)),
+                ('source', models.CharField(max_length=64)),
+                ('url_key', models.TextField(unique=True)),
+                ('title', models.TextField()),
+                ('content', models.TextField(blank=True, default='')),
+                ('content_hash', models.CharField(blank=True, default='', max_length=64)),
+                ('tags', news.models.TagsField(blank=True, default=list)),
+                ('published_at', models.DateTimeField(blank=True, null=True)),
+                ('scraped_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                'indexes': [news.models.TagsIndex(fields=['tags'], name='article_tags_gin'), models.Index(fields=['country', '-scraped_at', '-id'], name='article_country_scraped'), models.Index(fields=['-scraped_at', '-id'], name='article_scraped')],
+            },
+        ),
+    ]
@@ -0,0 +1,77 @@
+import hashlib
+
+from django.db import migrations
+
+from news.Functionality.db_writer import canonical_url, json_text
+
+# Country key -> (country table model, source name), as registered in sites.py
+# when this migration was written
+COUNTRY_TABLES = {
+    "usa": ("USANews", "USA Today"),
+    "india": ("IndiaNews", "NDTV India"),
+    "russia": ("RussiaNews", "TASS Russia"),
+    "china": ("ChinaNews", "CNN China"),
+    "australia": ("AustraliaNews", "ABC Australia"),
+}
+PAGE_SIZE = 500
+
+
+def backfill_articles(apps, schema_editor):
+    # Frozen copy of news.articles.copy_articles for the schema at this point
+    # (content still a column on Article)
+    Article = apps.get_model("news", "Article")
+    using = schema_editor.connection.alias
+    tables = set(schema_editor.connection.introspection.table_names())
+
+    for country, (model_name, source) in COUNTRY_TABLES.items():
+        model = apps.get_model("news", model_name)
+        if model._meta.db_table not in tables:
+            continue
+
+        last_id = 0
+        while True:
+            page = list(
+                model.objects.using(using).filter(id__gt=last_id).order_by("id")
+                .values("id", "created_at", "headline", "link", "content", "tags",
+                        "url_key", "content_hash")[:PAGE_SIZE]
+            )
+            if not page:
+                break
+            last_id = page[-1]["id"]
+
+            articles = {}
+            for row in page:
+                link = json_text(row["link"], "url")
+                url_key = row["url_key"] or (canonical_url(link) if link else None)
+                if not url_key:
+                    continue
+                content = row["content"] or ""
+                articles[url_key] = Article(
+                    country=country,
+                    source=source,
+                    url_key=url_key,
+                    title=json_text(row["headline"], "title"),
+                    content=content,
+                    content_hash=row["content_hash"]
+                    or hashlib.sha256(content.encode("utf-8")).hexdigest(),
+                    tags=row["tags"] or [],
+                    scraped_at=row["created_at"],
+                )
+            Article.objects.using(using).bulk_create(
+                list(articles.values()),
+                update_conflicts=True,
+                unique_fields=["url_key"],
+                update_fields=["country", "source", "title", "content", "content_hash",
+                               "tags", "scraped_at"],
+            )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('news', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_articles, migrations.RunPython.noop),
+    ]
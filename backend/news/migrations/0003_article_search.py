@@ -0,0 +1,68 @@
+from django.db import migrations
+
+SEARCH_CONFIG = "english"
+TITLE_WEIGHT = 10.0
+
+POSTGRES_SCHEMA = [
+    f"""ALTER TABLE news_article ADD COLUMN search tsvector GENERATED ALWAYS AS (
+        setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(title, '')), 'A') ||
+        setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(content, '')), 'B')
+    ) STORED""",
+    "CREATE INDEX article_search_gin ON news_article USING gin (search)",
+]
+POSTGRES_DROP = [
+    "DROP INDEX IF EXISTS article_search_gin",
+    "ALTER TABLE news_article DROP COLUMN IF EXISTS search",
+]
+
+SQLITE_SCHEMA = [
+    "CREATE VIRTUAL TABLE news_article_fts USING fts5("
+    "title, content, country, content='news_article', content_rowid='id', "
+    "tokenize='porter unicode61')",
+    "CREATE TRIGGER news_article_fts_insert AFTER INSERT ON news_article BEGIN "
+    "INSERT INTO news_article_fts (rowid, title, content, country) "
+    "VALUES (new.id, new.title, new.content, new.country); "
+    "END",
+    "CREATE TRIGGER news_article_fts_delete AFTER DELETE ON news_article BEGIN "
+    "INSERT INTO news_article_fts (news_article_fts, rowid, title, content, country) "
+    "VALUES ('delete', old.id, old.title, old.content, old.country); "
+    "END",
+    "CREATE TRIGGER news_article_fts_update AFTER UPDATE OF title, content, country "
+    "ON news_article BEGIN "
+    "INSERT INTO news_article_fts (news_article_fts, rowid, title, content, country) "
+    "VALUES ('delete', old.id, old.title, old.content, old.country); "
+    "INSERT INTO news_article_fts (rowid, title, content, country) "
+    "VALUES (new.id, new.title, new.content, new.country); "
+    "END",
+    # Index the rows that already exist, and make ORDER BY rank weight titles
+    "INSERT INTO news_article_fts (news_article_fts) VALUES ('rebuild')",
+    f"INSERT INTO news_article_fts (news_article_fts, rank) VALUES ('rank', 'bm25({TITLE_WEIGHT}, 1.0, 0.0)')",
+]
+SQLITE_DROP = [
+    "DROP TRIGGER IF EXISTS news_article_fts_insert",
+    "DROP TRIGGER IF EXISTS news_article_fts_delete",
+    "DROP TRIGGER IF EXISTS news_article_fts_update",
+    "DROP TABLE IF EXISTS news_article_fts",
+]
+
+
+def _run(statements_by_vendor):
+    def run(apps, schema_editor):
+        for sql in statements_by_vendor.get(schema_editor.connection.vendor, []):
+            schema_editor.execute(sql)
+    return run
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('news', '0002_backfill_articles'),
+    ]
+
+    operations = [
+        # Full-text search: a generated tsvector column on Postgres, FTS5 on SQLite
+        migrations.RunPython(
+            _run({"postgresql": POSTGRES_SCHEMA, "sqlite": SQLITE_SCHEMA}),
+            _run({"postgresql": POSTGRES_DROP, "sqlite": SQLITE_DROP}),
+        ),
+    ]
@@ -0,0 +1,104 @@
+# Generated by Django 5.2.18 on 2026-10-18 18:52
+
+import importlib
+import zlib
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+from news.search import POSTGRES_DROP, POSTGRES_SCHEMA, SQLITE_DROP, SQLITE_SCHEMA, index_articles
+
+# The search index from 0003 reads Article.content, which this migration removes
+search_0003 = importlib.import_module("news.migrations.0003_article_search")
+
+PAGE_SIZE = 500
+
+
+def _run(statements_by_vendor):
+    def run(apps, schema_editor):
+        for sql in statements_by_vendor.get(schema_editor.connection.vendor, []):
+            schema_editor.execute(sql)
+    return run
+
+
+def compress_bodies(apps, schema_editor):
+    Article = apps.get_model("news", "Article")
+    ArticleBody = apps.get_model("news", "ArticleBody")
+    using = schema_editor.connection.alias
+
+    last_id = 0
+    while True:
+        page = list(
+            Article.objects.using(using).filter(id__gt=last_id).order_by("id")
+            .values_list("id", "content")[:PAGE_SIZE]
+        )
+        if not page:
+            break
+        last_id = page[-1][0]
+        ArticleBody.objects.using(using).bulk_create([
+            ArticleBody(article_id=article_id, compressed=zlib.compress(content.encode("utf-8"), 9))
+            for article_id, content in page
+        ])
+
+
+def restore_bodies(apps, schema_editor):
+    Article = apps.get_model("news", "Article")
+    ArticleBody = apps.get_model("news", "ArticleBody")
+    using = schema_editor.connection.alias
+
+    for body in ArticleBody.objects.using(using).iterator(chunk_size=PAGE_SIZE):
+        Article.objects.using(using).filter(id=body.article_id).update(
+            content=zlib.decompress(bytes(body.compressed)).decode("utf-8")
+        )
+
+
+def create_search_index(apps, schema_editor):
+    _run({"postgresql": POSTGRES_SCHEMA, "sqlite": SQLITE_SCHEMA})(apps, schema_editor)
+
+    Article = apps.get_model("news", "Article")
+    using = schema_editor.connection.alias
+    last_id = 0
+    while True:
+        page = list(
+            Article.objects.using(using).filter(id__gt=last_id).order_by("id")
+            .values_list("id", "title", "country", "body__compressed")[:PAGE_SIZE]
+        )
+        if not page:
+            break
+        last_id = page[-1][0]
+        index_articles(schema_editor.connection, [
+            (article_id, title,
+             zlib.decompress(bytes(compressed)).decode("utf-8") if compressed else "",
+             country)
+            for article_id, title, country, compressed in page
+        ])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('news', '0003_article_search'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArticleBody',
+            fields=[
+                ('article', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='body', serialize=False, to='news.article')),
+                ('compressed', models.BinaryField()),
+            ],
+        ),
+        migrations.RunPython(compress_bodies, restore_bodies),
+        migrations.RunPython(
+            _run({"postgresql": search_0003.POSTGRES_DROP, "sqlite": search_0003.SQLITE_DROP}),
+            _run({"postgresql": search_0003.POSTGRES_SCHEMA, "sqlite": search_0003.SQLITE_SCHEMA}),
+        ),
+        migrations.RemoveField(
+            model_name='article',
+            name='content',
+        ),
+        migrations.RunPython(
+            create_search_index,
+            _run({"postgresql": POSTGRES_DROP, "sqlite": SQLITE_DROP}),
+        ),
+    ]
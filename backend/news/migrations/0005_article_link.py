@@ -0,0 +1,55 @@
+from django.db import migrations, models
+
+from news.Functionality.db_writer import canonical_url, json_text
+
+# Country table model of each country key, when this migration was written
+COUNTRY_TABLES = ["USANews", "IndiaNews", "RussiaNews", "ChinaNews", "AustraliaNews"]
+PAGE_SIZE = 500
+
+
+def backfill_links(apps, schema_editor):
+    """Original article URLs from the country tables, matched on url_key."""
+    Article = apps.get_model("news", "Article")
+    using = schema_editor.connection.alias
+    tables = set(schema_editor.connection.introspection.table_names())
+
+    for model_name in COUNTRY_TABLES:
+        model = apps.get_model("news", model_name)
+        if model._meta.db_table not in tables:
+            continue
+
+        last_id = 0
+        while True:
+            page = list(
+                model.objects.using(using).filter(id__gt=last_id).order_by("id")
+                .values_list("id", "link", "url_key")[:PAGE_SIZE]
+            )
+            if not page:
+                break
+            last_id = page[-1][0]
+
+            links = {}
+            for _, link, url_key in page:
+                link = json_text(link, "url")
+                if link:
+                    links[url_key or canonical_url(link)] = link
+            articles = list(Article.objects.using(using).filter(url_key__in=list(links)))
+            for article in articles:
+                article.link = links[article.url_key]
+            Article.objects.using(using).bulk_update(articles, ["link"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('news', '0004_article_body'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='article',
+            name='link',
+            field=models.TextField(blank=True, null=True),
+        ),
+        migrations.RunPython(backfill_links, migrations.RunPython.noop),
+    ]
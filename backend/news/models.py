@@ -1,15 +1,188 @@
+import zlib
 
+from django.contrib.postgres.indexes import GinIndex
 from django.db import models
+from django.db.models.functions import Coalesce
+from django.utils import timezone
 
-# class IndiaNews(models.Model):
-#     id = models.BigAutoField(primary_key=True)
-#     created_at = models.DateTimeField(auto_now_add=True)
-#     headline = models.JSONField(null=True, blank=True)
-#     link = models.JSONField(null=True, blank=True)
 
-#     class Meta:
-#         db_table = 'India_news'  # Match your exact table name
-#         managed = False  # Important: tells Django not to manage this table
+class TagsField(models.JSONField):
+    """
+    List of tag strings.
 
-#     def __str__(self):
-#         return f"News {self.id}"
\ No newline at end of file
+    Stored as a native text[] array on Postgres (the Supabase tables) and as
+    JSON text on other backends, so local SQLite stand-ins work too.
+    """
+
+    def db_type(self, connection):
+        if connection.vendor == "postgresql":
+            return "text[]"
+        return super().db_type(connection)
+
+    def from_db_value(self, value, expression, connection):
+        if isinstance(value, list):
+            return value
+        return super().from_db_value(value, expression, connection)
+
+    def get_db_prep_value(self, value, connection, prepared=False):
+        if connection.vendor == "postgresql":
+            return value
+        return super().get_db_prep_value(value, connection, prepared)
+
+    def get_placeholder(self, value, compiler, connection):
+        # Having this method keeps multi-row bulk_create on the VALUES path;
+        # Postgres' UNNEST path would cast the column to text[][], which fails
+        # on (and flattens) tag lists of different lengths
+        return "%s"
+
+
+@TagsField.register_lookup
+class HasTag(models.Lookup):
+    """`tags__has_tag="Politics"`: rows whose tag list contains the tag."""
+    lookup_name = "has_tag"
+    prepare_rhs = False
+
+    def get_db_prep_lookup(self, value, connection):
+        return "%s", [value]
+
+    def as_sql(self, compiler, connection):
+        lhs, lhs_params = self.process_lhs(compiler, connection)
+        rhs, rhs_params = self.process_rhs(compiler, connection)
+        if connection.vendor == "postgresql":
+            # Containment rather than = ANY(), so a GIN index on the column applies
+            return f"{lhs} @> ARRAY[{rhs}]::text[]", lhs_params + rhs_params
+        return (
+            f"EXISTS (SELECT 1 FROM json_each({lhs}) WHERE json_each.value = {rhs})",
+            lhs_params + rhs_params,
+        )
+
+
+class TagsIndex(GinIndex):
+    """GIN index on a TagsField; a plain index on backends without GIN."""
+
+    def create_sql(self, model, schema_editor, using="", **kwargs):
+        if schema_editor.connection.vendor != "postgresql":
+            return models.Index.create_sql(self, model, schema_editor, using=using, **kwargs)
+        return super().create_sql(model, schema_editor, using=using, **kwargs)
+
+
+class CountryNews(models.Model):
+    """
+    Common columns of the per-country news tables written by the scrapers.
+    """
+    id = models.BigAutoField(primary_key=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    headline = models.JSONField(null=True, blank=True)
+    link = models.JSONField(null=True, blank=True)
+    content = models.TextField(null=True, blank=True)
+    tags = TagsField(null=True, blank=True)
+    # Canonical article URL (unique) and sha256 of content, for incremental refresh
+    url_key = models.TextField(null=True, blank=True, unique=True)
+    content_hash = models.CharField(max_length=64, null=True, blank=True)
+
+    class Meta:
+        abstract = True
+
+    def __str__(self):
+        return f"News {self.id}"
+
+
+class USANews(CountryNews):
+    class Meta:
+        db_table = 'USA_news'
+        managed = False  # Table is owned by Supabase, not Django
+
+
+class IndiaNews(CountryNews):
+    class Meta:
+        db_table = 'India_news'
+        managed = False
+
+
+class RussiaNews(CountryNews):
+    class Meta:
+        db_table = 'Russia_news'
+        managed = False
+
+
+class ChinaNews(CountryNews):
+    class Meta:
+        db_table = 'China_news'
+        managed = False
+
+
+class AustraliaNews(CountryNews):
+    class Meta:
+        db_table = 'Australia_news'
+        managed = False
+
+
+# Country key -> model, in the order the scrapers are listed
+COUNTRY_MODELS = {
+    "usa": USANews,
+    "india": IndiaNews,
+    "russia": RussiaNews,
+    "china": ChinaNews,
+    "australia": AustraliaNews,
+}
+
+
+class Article(models.Model):
+    """
+    Every scraped article in one table, whatever its country.
+
+    Filled from the country tables (backfilled by migration 0002, then kept
+    in sync by `manage.py sync_articles` after each scrape run), with the
+    title and URL stored as plain columns instead of JSON strings. The body
+    lives compressed in ArticleBody, so listing articles never reads it.
+    """
+    id = models.BigAutoField(primary_key=True)
+    country = models.CharField(max_length=16)  # key of COUNTRY_MODELS
+    source = models.CharField(max_length=64)   # site name in sites.py
+    url_key = models.TextField(unique=True)    # canonical article URL
+    link = models.TextField(null=True, blank=True)  # URL as scraped, for readers
+    title = models.TextField()
+    content_hash = models.CharField(max_length=64, blank=True, default="")
+    tags = TagsField(default=list, blank=True)
+    published_at = models.DateTimeField(null=True, blank=True)
+    scraped_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        indexes = [
+            TagsIndex(fields=["tags"], name="article_tags_gin"),
+            models.Index(fields=["country", "-scraped_at", "-id"], name="article_country_scraped"),
+            models.Index(fields=["-scraped_at", "-id"], name="article_scraped"),
+        ]
+
+    def __str__(self):
+        return self.title
+
+
+# URL to show for an article: the link as scraped, or its canonical key for
+# rows copied before the link column existed
+ARTICLE_URL = Coalesce("link", "url_key")
+
+
+def compress_body(text):
+    return zlib.compress(text.encode("utf-8"), 9)
+
+
+def decompress_body(data):
+    return zlib.decompress(bytes(data)).decode("utf-8")
+
+
+class ArticleBody(models.Model):
+    """
+    An Article's text (paragraphs joined by blank lines), zlib-compressed.
+
+    One row per article in its own table, fetched only by the article-detail
+    endpoint.
+    """
+    article = models.OneToOneField(
+        Article, primary_key=True, on_delete=models.CASCADE, related_name="body"
+    )
+    compressed = models.BinaryField()
+
+    @property
+    def text(self):
+        return decompress_body(self.compressed)
@@ -0,0 +1,214 @@
+"""
+Full-text search over Article titles and content.
+
+Postgres: `news_article.search` is a tsvector column (title weighted above
+content) with a GIN index. SQLite: `news_article_fts` is an FTS5 table over
+the same text plus country (so a country filter is an index lookup too),
+ranked by bm25 with the same title weighting. Both are created by migration
+0004 and filled by index_articles() when articles are written, since the
+body is only stored compressed (ArticleBody). The SQLite FTS table keeps its
+own copy of the text; it is only the local stand-in.
+
+By default only the newest SEARCH_CANDIDATES matches of a query are ranked,
+so a word found in most articles costs the same as a rarer one; below that
+many matches the ranking is exact. Callers pass `depth` to rank more (or all)
+and are told when matches were left out. Only the ids and ranks of one page come out of the
+full-text query; the rows themselves are then loaded by primary key.
+"""
+import re
+
+from django.db import connections
+
+from .models import ARTICLE_URL, Article
+
+SEARCH_CONFIG = "english"
+# Relative weight of a title match over a content match in SQLite's bm25
+TITLE_WEIGHT = 10.0
+# Matches ranked per query by default, newest (highest id) first, and the most
+# /api/search/ lets a client ask for
+SEARCH_CANDIDATES = 4000
+SEARCH_MAX_DEPTH = 50000
+
+SEARCH_FIELDS = ("id", "country", "source", "title", "scraped_at", "tags")
+
+_WORD = re.compile(r"\w+", re.UNICODE)
+
+
+# ----------------------------------------------------------------------
+# SCHEMA (used by migration 0004)
+POSTGRES_SCHEMA = [
+    "ALTER TABLE news_article ADD COLUMN search tsvector",
+    "CREATE INDEX article_search_gin ON news_article USING gin (search)",
+]
+POSTGRES_DROP = [
+    "DROP INDEX IF EXISTS article_search_gin",
+    "ALTER TABLE news_article DROP COLUMN IF EXISTS search",
+]
+
+SQLITE_SCHEMA = [
+    "CREATE VIRTUAL TABLE news_article_fts USING fts5("
+    "title, content, country, tokenize='porter unicode61')",
+    "CREATE TRIGGER news_article_fts_delete AFTER DELETE ON news_article BEGIN "
+    "DELETE FROM news_article_fts WHERE rowid = old.id; "
+    "END",
+    # Make ORDER BY rank weight titles
+    f"INSERT INTO news_article_fts (news_article_fts, rank) VALUES ('rank', 'bm25({TITLE_WEIGHT}, 1.0, 0.0)')",
+]
+SQLITE_DROP = [
+    "DROP TRIGGER IF EXISTS news_article_fts_delete",
+    "DROP TABLE IF EXISTS news_article_fts",
+]
+
+
+def index_articles(connection, articles):
+    """
+    (Re)index articles for search.
+
+    Args:
+        connection: Django database connection
+        articles (list): (id, title, content, country) tuples, content as text
+    """
+    if not articles:
+        return
+    with connection.cursor() as cursor:
+        if connection.vendor == "postgresql":
+            cursor.executemany(
+                "UPDATE news_article SET search ="
+                " setweight(to_tsvector(%s, %s), 'A') ||"
+                " setweight(to_tsvector(%s, %s), 'B')"
+                " WHERE id = %s",
+                [(SEARCH_CONFIG, title, SEARCH_CONFIG, content, article_id)
+                 for article_id, title, content, _ in articles],
+            )
+        else:
+            cursor.executemany(
+                "DELETE FROM news_article_fts WHERE rowid = %s",
+                [(article_id,) for article_id, _, _, _ in articles],
+            )
+            cursor.executemany(
+                "INSERT INTO news_article_fts (rowid, title, content, country)"
+                " VALUES (%s, %s, %s, %s)",
+                articles,
+            )
+
+
+# ----------------------------------------------------------------------
+# QUERIES
+def fts5_query(text, country=None):
+    """
+    User text as an FTS5 query: every word must match, and each is quoted so
+    operators and punctuation in the input are taken literally. Empty if the
+    text has no words.
+
+    Words aren't limited to title/content with a column filter: that makes
+    FTS5 decode positions for every match, about 3x slower on common words.
+    A word can then match the country column, which carries no bm25 weight.
+    """
+    match = " ".join(f'"{word}"' for word in _WORD.findall(text))
+    if match and country:
+        match += f' AND country : "{country}"'
+    return match
+
+
+def _matches(connection, query, country):
+    """
+    (sql, params) selecting `id, rank` of every article matching the query,
+    higher rank better; None if the query has no words.
+    """
+    if connection.vendor == "postgresql":
+        where = "a.search @@ q"
+        params = [SEARCH_CONFIG, query]
+        if country:
+            where += " AND a.country = %s"
+            params.append(country)
+        return (
+            "SELECT a.id, ts_rank_cd(a.search, q) AS rank"
+            " FROM news_article a, websearch_to_tsquery(%s, %s) q"
+            f" WHERE {where}",
+            params,
+        )
+    match = fts5_query(query, country)
+    if not match:
+        return None
+    # bm25 is negative; flip it so both backends sort "higher is better"
+    return (
+        "SELECT rowid AS id, -rank AS rank FROM news_article_fts"
+        " WHERE news_article_fts MATCH %s",
+        [match],
+    )
+
+
+def _ranked_ids(connection, query, country, limit, offset, depth):
+    """
+    One page of matches, best first, and whether matches past `depth` were
+    left unranked.
+
+    Returns:
+        tuple: ([(id, rank)], truncated)
+    """
+    matches = _matches(connection, query, country)
+    if matches is None:
+        return [], False
+    sql, match_params = matches
+
+    candidates, params = sql, match_params
+    if depth is not None:
+        candidates += " ORDER BY id DESC LIMIT %s"
+        params = params + [depth]
+    with connection.cursor() as cursor:
+        # The window count is taken over every candidate, before the page is cut
+        cursor.execute(
+            f"SELECT id, rank, COUNT(*) OVER () FROM ({candidates}) candidates"
+            " ORDER BY rank DESC, id DESC LIMIT %s OFFSET %s",
+            params + [limit, offset],
+        )
+        rows = cursor.fetchall()
+        ranked = [(row_id, rank) for row_id, rank, _ in rows]
+        if depth is None or (rows and rows[0][2] < depth):
+            return ranked, False
+
+        # Exactly `depth` candidates (or a page past them): is there one more?
+        # (the subquery is flattened, so no rank is computed for skipped rows)
+        cursor.execute(f"SELECT 1 FROM ({sql}) m LIMIT 1 OFFSET %s", match_params + [depth])
+        return ranked, cursor.fetchone() is not None
+
+
+def search_articles(query, country=None, limit=10, offset=0, depth=SEARCH_CANDIDATES,
+                    using="default"):
+    """
+    One page of articles matching `query`, best match first.
+
+    Only the newest `depth` matches are ranked, which keeps words found in
+    most articles as fast as rare ones; pages past them are empty, and
+    `truncated` says whether any matches were left out. depth=None ranks
+    every match.
+
+    Args:
+        query (str): Words to search for; all of them must match
+        country (str): Only this COUNTRY_MODELS key (None for all)
+        limit (int): Page size
+        offset (int): Matches to skip
+        depth (int): Newest matches to rank (None for all of them)
+        using (str): Database alias
+
+    Returns:
+        tuple: (rows as dicts with a "rank", whether more ranked matches
+               follow, whether matches past `depth` were left unranked)
+    """
+    # One extra row tells us whether there is a next page
+    ranked, truncated = _ranked_ids(connections[using], query, country, limit + 1, offset, depth)
+    has_more = len(ranked) > limit
+    ranked = ranked[:limit]
+
+    ranks = dict(ranked)
+    rows = {
+        row["id"]: row
+        for row in Article.objects.using(using)
+        .filter(id__in=list(ranks))
+        .values(*SEARCH_FIELDS, url=ARTICLE_URL)
+    } if ranks else {}
+    page = []
+    for row_id, _ in ranked:
+        if row_id in rows:  # deleted between the two queries
+            page.append({**rows[row_id], "rank": ranks[row_id]})
+    return page, has_more, truncated
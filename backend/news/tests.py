@@ -1,3 +1,925 @@
-from django.test import TestCase
+import asyncio
+import functools
+import json
+import multiprocessing
+import os
+import shutil
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from io import StringIO
+from unittest import mock
 
-# Create your tests here.
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from news.Functionality.db_writer import BatchWriter, SQLiteSink, article_row, canonical_url
+from news.Functionality.fetching import (
+    AsyncFetcher, HttpFetcher, extract_headlines, extract_paragraphs,
+)
+from news.Functionality.http_cache import EVICT_BATCH, HttpCache
+from news.Functionality.tag_cache import TagCache
+from news.Functionality.tagging import CompiledVocabulary, build_matcher, read_vocabulary, score_text
+from news.articles import copy_articles, sync_countries
+from news.models import Article, ArticleBody, IndiaNews, RussiaNews, USANews, compress_body
+from news.search import SEARCH_MAX_DEPTH, index_articles, search_articles
+from news.views import decode_cursor, encode_cursor, negotiate_encoding
+
+# Fixture pages, served over HTTP by FetchingTests
+TESTDATA = os.path.join(os.path.dirname(os.path.abspath(__file__)), "testdata")
+FUNCTIONALITY = os.path.join(os.path.dirname(os.path.abspath(__file__)), "Functionality")
+
+
+def scraper_module():
+    """Combined_webscraper, which imports its siblings as top-level modules."""
+    if FUNCTIONALITY not in sys.path:
+        sys.path.insert(0, FUNCTIONALITY)
+    import Combined_webscraper
+    return Combined_webscraper
+
+
+class NoBrowser:
+    """DriverPool stand-in for paths that must never start Chrome."""
+
+    def lease(self):
+        raise AssertionError("browser leased")
+
+LISTING_SPEC = {"row": "li.story", "title": "h2", "link": "a"}
+BODY_SELECTORS = ["div.article-body p", "article p"]
+
+
+class QuietHandler(SimpleHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+
+# ----------------------------------------------------------------------
+# FETCHING AND EXTRACTION
+class FetchingTests(SimpleTestCase):
+    """HttpFetcher and the extractors against the fixture pages on a local server."""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        handler = functools.partial(QuietHandler, directory=TESTDATA)
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        cls.base = f"http://127.0.0.1:{cls.server.server_port}/"
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+        super().tearDownClass()
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.fetcher = HttpFetcher(timeout=5)
+
+    def tearDown(self):
+        self.fetcher.close()
+        shutil.rmtree(self.tmp)
+
+    def test_headlines_have_absolute_http_links(self):
+        doc = self.fetcher.get_document(self.base + "listing.html")
+        self.assertEqual(extract_headlines(doc, LISTING_SPEC), [
+            ("Parliament passes election reform", self.base + "world/election-reform.html"),
+            ("Flood waters rise in the north", "https://example.com/world/floods?utm_source=home"),
+            ("Markets close higher", self.base + "markets.html"),
+        ])
+
+    def test_headline_limit(self):
+        doc = self.fetcher.get_document(self.base + "listing.html")
+        self.assertEqual(len(extract_headlines(doc, LISTING_SPEC, limit=2)), 2)
+
+    def test_paragraphs_from_first_matching_selector(self):
+        doc = self.fetcher.get_document(self.base + "article.html")
+        self.assertEqual(extract_paragraphs(doc, BODY_SELECTORS), [
+            "Parliament passed the election reform bill late on Tuesday.",
+            "The minister said the new rules take effect next year.",
+        ])
+
+    def test_paragraphs_fall_back_to_later_selectors(self):
+        doc = self.fetcher.get_document(self.base + "article_plain.html")
+        self.assertEqual(extract_paragraphs(doc, BODY_SELECTORS), [
+            "Flood waters rose after three days of heavy rain.",
+            "Rescue teams evacuated several villages.",
+        ])
+        # Too few matches for min_paragraphs moves on to the next selector
+        doc = self.fetcher.get_document(self.base + "article.html")
+        self.assertEqual(len(extract_paragraphs(doc, BODY_SELECTORS, min_paragraphs=3)), 3)
+        self.assertEqual(extract_paragraphs(doc, BODY_SELECTORS, min_paragraphs=4), [])
+
+    def test_fallback_selector_keeps_long_paragraphs(self):
+        scraper = scraper_module()
+        doc = self.fetcher.get_document(self.base + "article_plain.html")
+        config = {"article_selectors": ["div.sp_txt p"], "min_paragraphs": 3}
+        self.assertEqual(scraper.article_paragraphs(config, doc), [])
+        config["fallback_selector"] = "p"
+        self.assertEqual(scraper.article_paragraphs(config, doc), [])  # both 50 characters or fewer
+        config["fallback_longer_than"] = 45
+        self.assertEqual(scraper.article_paragraphs(config, doc),
+                         ["Flood waters rose after three days of heavy rain."])
+
+    def test_http_only_listing_never_falls_back_to_the_browser(self):
+        scraper = scraper_module()
+        config = {"url": self.base + "listing.html", "render": "http",
+                  "headline_selectors": LISTING_SPEC, "max_articles": 2}
+        self.assertEqual(len(scraper.load_headlines(config, self.fetcher, NoBrowser())), 2)
+        for url in ("missing.html", "article.html"):  # failed fetch, no headlines
+            config["url"] = self.base + url
+            self.assertEqual(scraper.load_headlines(config, self.fetcher, NoBrowser()), [])
+
+    def test_missing_page_is_none(self):
+        self.assertIsNone(self.fetcher.get_html(self.base + "missing.html"))
+        self.assertIsNone(self.fetcher.get_document(self.base + "missing.html"))
+
+    def test_cache_serves_fresh_pages_and_revalidates_stale_ones(self):
+        cache = HttpCache(os.path.join(self.tmp, "http_cache.sqlite3"))
+        url = self.base + "article.html"
+        with HttpFetcher(timeout=5, cache=cache) as fetcher:
+            first = fetcher.get_html(url, ttl=60)
+            self.assertIn("election reform", first)
+            self.assertEqual(fetcher.get_html(url, ttl=60), first)
+            # ttl=None sends If-Modified-Since; the server answers 304
+            self.assertEqual(fetcher.get_html(url), first)
+        cache.close()
+        self.assertEqual((cache.misses, cache.hits, cache.revalidated), (1, 1, 1))
+
+    def test_async_fetcher_shares_the_cache(self):
+        cache = HttpCache(os.path.join(self.tmp, "http_cache.sqlite3"))
+        urls = [self.base + name for name in ("listing.html", "article.html", "missing.html")]
+
+        async def fetch_twice():
+            async with AsyncFetcher(concurrency=2, cache=cache) as fetcher:
+                first = dict([page async for page in fetcher.iter_pages(urls, ttl=60)])
+                second = dict([page async for page in fetcher.iter_pages(urls, ttl=60)])
+            return first, second
+
+        first, second = asyncio.run(fetch_twice())
+        cache.close()
+        self.assertIsNone(first[urls[2]])
+        self.assertIn("election reform", first[urls[1]])
+        self.assertEqual(first, second)
+        self.assertEqual((cache.misses, cache.hits), (2, 2))
+
+    def test_cache_evicts_least_recently_used_pages(self):
+        cache = HttpCache(os.path.join(self.tmp, "http_cache.sqlite3"), max_bytes=2000)
+        conn = cache._connect()
+        for i in range(20):
+            # Random text barely compresses, so each page stores ~300 bytes
+            cache.put(f"{self.base}{i}", os.urandom(150).hex())
+        cache.put(f"{self.base}19", "small")
+        total = conn.execute("SELECT total FROM pages_size").fetchone()[0]
+        self.assertEqual(total, conn.execute("SELECT SUM(size) FROM pages").fetchone()[0])
+        self.assertLessEqual(total, 2000)
+        self.assertGreater(cache.evictions, 0)
+        self.assertIsNone(cache.get(f"{self.base}0"))
+        self.assertEqual(cache.get(f"{self.base}19")["text"], "small")
+        cache.close()
+
+    def test_eviction_spans_several_batches(self):
+        cache = HttpCache(os.path.join(self.tmp, "http_cache.sqlite3"))
+        for i in range(EVICT_BATCH * 2 + 10):
+            cache.put(f"{self.base}{i}", os.urandom(150).hex())
+        cache.max_bytes = 1000
+        cache.put(f"{self.base}last", "small")
+        conn = cache._connect()
+        self.assertLessEqual(conn.execute("SELECT SUM(size) FROM pages").fetchone()[0], 1000)
+        self.assertGreater(cache.evictions, EVICT_BATCH * 2)
+        self.assertEqual(cache.get(f"{self.base}last")["text"], "small")
+        cache.close()
+
+    def test_counters_from_many_threads(self):
+        cache = HttpCache(os.path.join(self.tmp, "http_cache.sqlite3"))
+
+        def count():
+            for _ in range(2000):
+                cache.record("hits")
+                cache.record("misses")
+
+        threads = [threading.Thread(target=count) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        stats = cache.stats()
+        self.assertEqual((stats["hits"], stats["misses"], stats["hit_rate"]), (16000, 16000, 0.5))
+        self.assertEqual(HttpCache().path, os.path.join(FUNCTIONALITY, "http_cache.sqlite3"))
+
+
+# ----------------------------------------------------------------------
+# TAGGING
+class VocabularyTests(SimpleTestCase):
+    """Keywords with punctuation or odd spacing, as an editor may write them."""
+
+    def test_keywords_match_like_whole_word_regexes(self):
+        matcher = build_matcher({
+            "Health": ["covid-19", "u.s. health", "mental  health"],
+            "Politics": ["white house"],
+        })
+        text = ("covid-19 cases rose; u.s. health officials discussed mental health. "
+                "covid 19, white  house and the white house")
+        # "covid 19" and "white  house" are not the keywords' spelling
+        self.assertEqual(score_text(text, matcher, 2), [3, 1])
+
+    def test_same_words_different_punctuation_are_separate_keywords(self):
+        matcher = build_matcher({"A": ["covid-19"], "B": ["covid 19"]})
+        self.assertEqual(score_text("covid-19 and covid 19 and covid 19", matcher, 2), [1, 2])
+
+    def test_unmatchable_keywords_are_rejected(self):
+        for keyword in ["u.s.", "#metoo", "  ", "-19"]:
+            with self.subTest(keyword=keyword), self.assertRaisesRegex(ValueError, "Health"):
+                CompiledVocabulary({"Health": ["health", keyword]})
+
+    def test_read_vocabulary_reports_the_bad_keyword(self):
+        tmp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmp)
+        path = os.path.join(tmp, "vocabulary.json")
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"version": 1, "tags": {"Politics": ["u.s."]}}, f)
+        with self.assertRaisesRegex(ValueError, "'u.s.'"):
+            read_vocabulary(path)
+
+
+# ----------------------------------------------------------------------
+# DATABASE WRITES
+def row(title, link, paragraphs=("Body.",), tags=("Political",)):
+    return article_row(title, link, list(paragraphs), list(tags))
+
+
+class DbWriterTests(SimpleTestCase):
+    """BatchWriter in front of a SQLiteSink on a temporary database file."""
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmp, "news.sqlite3")
+        self.sink = SQLiteSink(self.path)
+
+    def tearDown(self):
+        self.sink.close()
+        shutil.rmtree(self.tmp)
+
+    def titles(self, table="USA_news"):
+        return sorted(json.loads(r["headline"])["title"] for r in self.sink.list_rows(table))
+
+    def test_canonical_url(self):
+        self.assertEqual(
+            canonical_url("http://WWW.Example.com/world/story/?utm_source=x&b=2&a=1#top"),
+            "https://example.com/world/story?a=1&b=2",
+        )
+
+    def test_writes_in_batches_and_flushes_on_close(self):
+        writer = BatchWriter(self.sink, batch_size=2, flush_interval=None)
+        for i in range(5):
+            writer.add("USA_news", row(f"Story {i}", f"https://example.com/{i}"))
+        self.assertEqual(writer.stats()["batches"], 2)
+        self.assertEqual(len(self.titles()), 4)
+
+        writer.close()
+        self.assertEqual(writer.stats(), {"rows_written": 5, "batches": 3, "failed_rows": 0})
+        self.assertEqual(self.titles(), [f"Story {i}" for i in range(5)])
+        with self.assertRaises(RuntimeError):
+            writer.add("USA_news", row("Late", "https://example.com/late"))
+
+    def test_flush_interval_writes_partial_batches(self):
+        with BatchWriter(self.sink, batch_size=100, flush_interval=0.05) as writer:
+            writer.add("India_news", row("Monsoon arrives", "https://example.in/monsoon"))
+            for _ in range(100):
+                if writer.rows_written:
+                    break
+                time.sleep(0.02)
+            self.assertEqual(writer.rows_written, 1)
+        self.assertEqual(self.titles("India_news"), ["Monsoon arrives"])
+
+    def test_bad_rows_fail_alone(self):
+        bad = row("Broken", "https://example.com/broken")
+        del bad["headline"]
+        with BatchWriter(self.sink, batch_size=10, flush_interval=None) as writer:
+            writer.add("USA_news", row("Good one", "https://example.com/1"))
+            writer.add("USA_news", bad)
+            writer.add("USA_news", row("Good two", "https://example.com/2"))
+        self.assertEqual(self.titles(), ["Good one", "Good two"])
+        self.assertEqual(writer.stats()["failed_rows"], 1)
+        self.assertIs(writer.failures[0][1], bad)
+
+    def test_upsert_replaces_rows_with_the_same_canonical_url(self):
+        with BatchWriter(self.sink, flush_interval=None, upsert=True) as writer:
+            writer.add("USA_news", row("First", "https://www.example.com/a?utm_source=x"))
+        with BatchWriter(self.sink, flush_interval=None, upsert=True) as writer:
+            # Twice in one batch as well: only the last one is written
+            writer.add("USA_news", row("Second", "https://example.com/a", ["Old."]))
+            writer.add("USA_news", row("Third", "https://example.com/a/", ["New."], ["Crime"]))
+
+        rows = self.sink.list_rows("USA_news")
+        self.assertEqual(len(rows), 1)
+        self.assertEqual(json.loads(rows[0]["headline"])["title"], "Third")
+        self.assertEqual(rows[0]["tags"], ["Crime"])
+        hashes = self.sink.stored_hashes("USA_news", ["https://example.com/a", "https://example.com/b"])
+        self.assertEqual(hashes, {"https://example.com/a": row("", "https://x", ["New."])["content_hash"]})
+
+    def test_expire_and_clear(self):
+        self.sink.insert_many("USA_news", [
+            row("Old", "https://example.com/old"), row("New", "https://example.com/new"),
+        ])
+        with sqlite3.connect(self.path) as conn:
+            conn.execute("UPDATE USA_news SET created_at = '2000-01-01 00:00:00' WHERE url_key LIKE '%old'")
+        self.sink.expire("USA_news", timedelta(hours=48))
+        self.assertEqual(self.titles(), ["New"])
+        self.sink.clear("USA_news")
+        self.assertEqual(self.titles(), [])
+
+    def test_sink_closes_with_its_block(self):
+        with BatchWriter(self.sink, flush_interval=None) as writer:
+            writer.add("USA_news", row("Kept open", "https://example.com/open"))
+        self.assertEqual(self.titles(), ["Kept open"])  # the writer leaves the sink open
+
+        with SQLiteSink(self.path) as sink:
+            self.assertEqual(len(sink.list_rows("USA_news")), 1)
+        with self.assertRaises(sqlite3.ProgrammingError):
+            sink.list_rows("USA_news")
+
+    def test_still_listed_rows_do_not_expire(self):
+        self.sink.insert_many("USA_news", [
+            row("Front page", "https://example.com/front"), row("Gone", "https://example.com/gone"),
+        ])
+        with sqlite3.connect(self.path) as conn:
+            conn.execute("UPDATE USA_news SET created_at = '2000-01-01 00:00:00'")
+
+        scraper = scraper_module()
+        config = {"table": "USA_news"}
+        headlines = [("Front page", "https://www.example.com/front"), ("Fresh", "https://example.com/fresh")]
+        with BatchWriter(self.sink, flush_interval=None, upsert=True) as writer:
+            remaining, stored = scraper.skip_stored(config, writer, headlines)
+            self.assertEqual(remaining, [("Fresh", "https://example.com/fresh")])
+            self.assertEqual(list(stored), ["https://example.com/front"])
+            # refetch_stored fetches everything but still marks stored rows seen
+            remaining, _ = scraper.skip_stored({**config, "refetch_stored": True}, writer, headlines)
+            self.assertEqual(remaining, headlines)
+
+        self.sink.expire("USA_news", timedelta(hours=48))
+        self.assertEqual(self.titles(), ["Front page"])
+
+
+# ----------------------------------------------------------------------
+# ORCHESTRATOR
+def grouped_sleep():
+    os.setpgrp()
+    time.sleep(60)
+
+
+class OrchestratorKillTests(SimpleTestCase):
+    """orchestrator._kill, before and after the child has made its own process group."""
+
+    def kill(self, target):
+        scraper_module()
+        import orchestrator
+
+        process = multiprocessing.Process(target=target, args=() if target is grouped_sleep else (60,))
+        process.start()
+        if target is grouped_sleep:
+            deadline = time.monotonic() + 5
+            while os.getpgid(process.pid) != process.pid and time.monotonic() < deadline:
+                time.sleep(0.01)
+        orchestrator._kill(process)
+        return process
+
+    def test_kill_before_setpgrp(self):
+        # Still in the parent's group: killpg must not be aimed at it
+        self.assertEqual(self.kill(time.sleep).exitcode, -9)
+
+    def test_kill_after_setpgrp(self):
+        self.assertEqual(self.kill(grouped_sleep).exitcode, -9)
+
+
+# ----------------------------------------------------------------------
+# GLOBE SNAPSHOT
+class GlobeSnapshotTests(SimpleTestCase):
+    """Content-Encoding negotiation of /api/globe/."""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.tmp = tempfile.mkdtemp()
+        for name, body in [("globe.json", b"{}"), ("globe.json.gz", b"gz"),
+                           ("globe.json.br", b"br"), ("globe.etag", b"abc")]:
+            with open(os.path.join(cls.tmp, name), "wb") as f:
+                f.write(body)
+        cls.settings_override = override_settings(GLOBE_SNAPSHOT_DIR=cls.tmp)
+        cls.settings_override.enable()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.settings_override.disable()
+        shutil.rmtree(cls.tmp)
+        super().tearDownClass()
+
+    def test_negotiate_encoding(self):
+        available = ["br", "gzip", "identity"]
+        for header, expected in [
+            ("", "identity"),
+            ("gzip, deflate, br", "br"),
+            ("GZIP", "gzip"),
+            ("gzip;q=0", "identity"),
+            ("br;q=0, gzip", "gzip"),
+            ("br;q=0.5, gzip;q=0.8", "gzip"),
+            ("gzip;q=0.5, identity;q=1", "identity"),
+            ("gzip;q=abc", "identity"),
+            ("*", "br"),
+            ("br;q=0, *;q=0.1", "gzip"),
+            ("identity;q=0", None),
+            ("*;q=0", None),
+            ("xgzip", "identity"),
+        ]:
+            with self.subTest(header=header):
+                self.assertEqual(negotiate_encoding(header, available), expected)
+
+    def test_refused_encoding_is_not_sent(self):
+        response = self.client.get("/api/globe/", HTTP_ACCEPT_ENCODING="gzip;q=0")
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn("Content-Encoding", response)
+        self.assertEqual(response.content, b"{}")
+
+        response = self.client.get("/api/globe/", HTTP_ACCEPT_ENCODING="br;q=0, gzip;q=1")
+        self.assertEqual((response["Content-Encoding"], response.content), ("gzip", b"gz"))
+
+        response = self.client.get("/api/globe/", HTTP_ACCEPT_ENCODING="identity;q=0")
+        self.assertEqual(response.status_code, 406)
+
+    def test_not_modified(self):
+        response = self.client.get("/api/globe/", HTTP_IF_NONE_MATCH='"abc"')
+        self.assertEqual(response.status_code, 304)
+
+    def test_latest_headlines_carry_article_ids(self):
+        scraper_module()
+        from snapshot import build_snapshot
+
+        class Sink:
+            def list_rows(self, table):
+                return [
+                    {"id": 7, "created_at": "2026-01-01 12:00:00", "url_key": "example.com/a",
+                     "headline": json.dumps({"title": "Synced"}), "link": '"https://example.com/a"',
+                     "tags": ["Weather"]},
+                    {"id": 8, "created_at": "2026-01-01 11:00:00", "url_key": "example.com/b",
+                     "headline": json.dumps({"title": "Not synced yet"}), "link": '"https://example.com/b"',
+                     "tags": []},
+                ]
+
+            def article_ids(self, url_keys):
+                return {"example.com/a": 42}
+
+        site = {"country": "usa", "table": "USA_news"}
+        latest = build_snapshot(Sink(), sites=[site])["countries"]["usa"]["latest"]
+        self.assertEqual([(item["id"], item["headline"]["title"]) for item in latest],
+                         [(42, "Synced"), (None, "Not synced yet")])
+
+
+# ----------------------------------------------------------------------
+# NEWS API
+SCRAPED = datetime(2026, 1, 1, 12, 0, tzinfo=timezone.utc)
+
+
+def make_article(title, country="usa", tags=(), minutes=0, **fields):
+    """An Article scraped `minutes` before SCRAPED."""
+    return Article.objects.create(
+        country=country, source="Test", url_key=f"https://example.com/{country}/{title}",
+        title=title, tags=list(tags), scraped_at=SCRAPED - timedelta(minutes=minutes), **fields,
+    )
+
+
+class NewsListTests(TestCase):
+    """GET /api/news/<country>/: keyset paging, filters, errors and caching."""
+
+    @classmethod
+    def setUpTestData(cls):
+        # Several articles share a timestamp, so paging has to break ties by id
+        cls.articles = [
+            make_article("Budget vote", tags=["Political", "Economy"]),
+            make_article("Storm warning", tags=["Weather"]),
+            make_article("Senate recess", tags=["Political"]),
+            make_article("Monsoon floods", country="india", tags=["Weather"]),
+            make_article("Cricket final", country="india", tags=["Sports"], minutes=5),
+            make_article("Trade talks", tags=["Economy"], minutes=5),
+            make_article("Old story", tags=["Politics"], minutes=60),
+        ]
+
+    def setUp(self):
+        cache.clear()
+
+    def get(self, path, **params):
+        return self.client.get(path, params)
+
+    def page_through(self, path, limit, **params):
+        ids, cursor, pages = [], None, 0
+        while True:
+            query = {"limit": limit, **params}
+            if cursor:
+                query["cursor"] = cursor
+            body = self.get(path, **query).json()
+            ids += [row["id"] for row in body["results"]]
+            pages += 1
+            cursor = body["next_cursor"]
+            if cursor is None:
+                return ids, pages
+
+    def newest_first(self, articles):
+        return [a.id for a in sorted(articles, key=lambda a: (a.scraped_at, a.id), reverse=True)]
+
+    def test_cursor_pages_cover_every_article_once(self):
+        expected = self.newest_first(self.articles)
+        for limit in (1, 2, 3, 7, 50):
+            with self.subTest(limit=limit):
+                ids, pages = self.page_through("/api/news/all/", limit)
+                self.assertEqual(ids, expected)
+                self.assertEqual(pages, max(1, -(-len(expected) // limit)))
+
+    def test_cursor_round_trip(self):
+        article = self.articles[0]
+        row = {"scraped_at": article.scraped_at, "id": article.id}
+        self.assertEqual(decode_cursor(encode_cursor(row)), (article.scraped_at, article.id))
+
+    def test_country(self):
+        body = self.get("/api/news/INDIA/").json()
+        self.assertEqual(body["country"], "india")
+        self.assertEqual([r["title"] for r in body["results"]], ["Monsoon floods", "Cricket final"])
+        ids, _ = self.page_through("/api/news/usa/", 2)
+        self.assertEqual(ids, self.newest_first([a for a in self.articles if a.country == "usa"]))
+
+    def test_rows(self):
+        row = self.get("/api/news/all/", limit=1).json()["results"][0]
+        self.assertEqual(set(row), {"id", "country", "source", "title", "scraped_at", "tags", "url"})
+
+    def test_tag_filter_matches_whole_tags(self):
+        body = self.get("/api/news/all/", tag="Political").json()
+        self.assertEqual([r["title"] for r in body["results"]], ["Senate recess", "Budget vote"])
+        ids, _ = self.page_through("/api/news/all/", 1, tag="Economy")
+        self.assertEqual(ids, self.newest_first([a for a in self.articles if "Economy" in a.tags]))
+        self.assertEqual(self.get("/api/news/india/", tag="Political").json()["results"], [])
+        self.assertEqual(self.get("/api/news/all/", tag="Polit").json()["results"], [])
+
+    def test_unknown_country(self):
+        self.assertEqual(self.get("/api/news/mars/").status_code, 404)
+
+    def test_malformed_cursor_or_limit(self):
+        for params in [{"cursor": "!!!"}, {"cursor": "Zm9v"}, {"cursor": "eHx5"},
+                       {"limit": "ten"}, {"limit": "0"}, {"limit": "-3"}]:
+            with self.subTest(**params):
+                self.assertEqual(self.get("/api/news/all/", **params).status_code, 400)
+
+    def test_limit_is_capped(self):
+        for i in range(60):
+            make_article(f"Filler {i}", minutes=120)
+        self.assertEqual(len(self.get("/api/news/all/", limit=500).json()["results"]), 50)
+
+    def test_cached_until_the_scrape_stamp_changes(self):
+        tmp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmp)
+        stamp = os.path.join(tmp, "last_scrape.stamp")
+        open(stamp, "w").close()
+        os.utime(stamp, ns=(1, 1))
+
+        with override_settings(NEWS_SCRAPE_STAMP=stamp):
+            before = self.get("/api/news/usa/", limit=1).json()["results"]
+            make_article("Breaking news", minutes=-1)
+            self.assertEqual(self.get("/api/news/usa/", limit=1).json()["results"], before)
+
+            os.utime(stamp, ns=(2, 2))  # a scrape run finished
+            after = self.get("/api/news/usa/", limit=1).json()["results"]
+        self.assertEqual(after[0]["title"], "Breaking news")
+
+
+class ArticleDetailTests(TestCase):
+    """GET /api/articles/<id>/: one article with its decompressed body."""
+
+    def test_body_round_trip(self):
+        text = "Première ligne.\n\nSecond paragraph — with “quotes”."
+        article = make_article("Budget vote", tags=["Economy"], link="https://example.com/budget?id=1")
+        ArticleBody.objects.create(article=article, compressed=compress_body(text))
+        self.assertNotEqual(bytes(ArticleBody.objects.get(article=article).compressed), text.encode())
+        self.assertEqual(ArticleBody.objects.get(article=article).text, text)
+
+        body = self.client.get(f"/api/articles/{article.id}/").json()
+        self.assertEqual(body["content"], text)
+        self.assertEqual(body["id"], article.id)
+        self.assertEqual(body["url"], "https://example.com/budget?id=1")
+        self.assertEqual(body["tags"], ["Economy"])
+
+    def test_missing_body(self):
+        article = make_article("Headline only")
+        body = self.client.get(f"/api/articles/{article.id}/").json()
+        self.assertEqual(body["content"], "")
+        self.assertEqual(body["url"], article.url_key)
+
+    def test_unknown_article(self):
+        response = self.client.get("/api/articles/999999/")
+        self.assertEqual(response.status_code, 404)
+        self.assertIn("error", response.json())
+
+
+# ----------------------------------------------------------------------
+# SEARCH
+class CountryTablesMixin:
+    """
+    Creates the country tables (owned by Supabase, so unmanaged) for a
+    TestCase. Done before TestCase opens its class-wide transaction: SQLite
+    can't change its schema inside one.
+    """
+    country_models = [USANews, IndiaNews]
+
+    @classmethod
+    def setUpClass(cls):
+        with connection.schema_editor() as editor:
+            for model in cls.country_models:
+                editor.create_model(model)
+        super().setUpClass()
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        with connection.schema_editor() as editor:
+            for model in cls.country_models:
+                editor.delete_model(model)
+
+
+def index(articles, bodies):
+    index_articles(connection, [
+        (a.id, a.title, bodies.get(a.title, ""), a.country) for a in articles
+    ])
+
+
+class SearchTests(TestCase):
+    """news.search.search_articles and GET /api/search/."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.articles = {
+            a.title: a for a in [
+                make_article("Flood relief arrives"),
+                make_article("Monsoon season", country="india"),
+                make_article("Election results", minutes=5),
+                make_article("Flood warnings issued", country="india", minutes=10),
+            ]
+        }
+        index(cls.articles.values(), {
+            "Monsoon season": "Rivers burst their banks and flood relief camps opened.",
+            "Election results": "Turnout was high despite the weather.",
+        })
+
+    def setUp(self):
+        cache.clear()
+
+    def titles(self, rows):
+        return [row["title"] for row in rows]
+
+    def test_title_matches_rank_above_body_matches(self):
+        rows, has_more, truncated = search_articles("flood relief")
+        self.assertEqual(self.titles(rows), ["Flood relief arrives", "Monsoon season"])
+        self.assertGreater(rows[0]["rank"], rows[1]["rank"])
+        self.assertEqual((has_more, truncated), (False, False))
+
+    def test_every_word_must_match(self):
+        self.assertEqual(self.titles(search_articles("flood warnings")[0]), ["Flood warnings issued"])
+        self.assertEqual(search_articles("flood election")[0], [])
+        self.assertEqual(search_articles("?!")[0], [])
+
+    def test_country_filter(self):
+        rows, _, _ = search_articles("flood", country="india")
+        self.assertEqual(set(self.titles(rows)), {"Monsoon season", "Flood warnings issued"})
+        self.assertEqual(search_articles("election", country="india")[0], [])
+
+    def test_depth_ranks_only_the_newest_matches(self):
+        # Newest first: relief (0 min), warnings (10 min); Monsoon's match is in the body
+        rows, has_more, truncated = search_articles("flood", depth=2)
+        self.assertEqual(len(rows), 2)
+        self.assertTrue(truncated)
+        self.assertFalse(has_more)
+        self.assertFalse(search_articles("flood", depth=3)[2])
+        self.assertEqual(len(search_articles("flood", depth=None)[0]), 3)
+        self.assertFalse(search_articles("flood", depth=None)[2])
+
+    def test_api_pages(self):
+        first = self.client.get("/api/search/", {"q": "flood", "limit": 2}).json()
+        self.assertEqual((len(first["results"]), first["next_page"]), (2, 2))
+        self.assertEqual(set(first["results"][0]), {
+            "id", "country", "source", "title", "scraped_at", "tags", "url", "rank",
+        })
+        second = self.client.get("/api/search/", {"q": "flood", "limit": 2, "page": 2}).json()
+        self.assertEqual((len(second["results"]), second["next_page"]), (1, None))
+        self.assertFalse(second["truncated"])
+        ids = [r["id"] for r in first["results"] + second["results"]]
+        self.assertEqual(len(set(ids)), 3)
+
+    def test_api_depth(self):
+        body = self.client.get("/api/search/", {"q": "flood", "depth": 1, "limit": 5}).json()
+        self.assertEqual((body["depth"], body["truncated"], len(body["results"])), (1, True, 1))
+        self.assertIsNone(body["next_page"])
+        ok = self.client.get("/api/search/", {"q": "flood", "depth": SEARCH_MAX_DEPTH})
+        self.assertEqual(ok.status_code, 200)
+        for depth in (0, -1, SEARCH_MAX_DEPTH + 1, "many"):
+            with self.subTest(depth=depth):
+                response = self.client.get("/api/search/", {"q": "flood", "depth": depth})
+                self.assertEqual(response.status_code, 400)
+
+    def test_api_errors(self):
+        self.assertEqual(self.client.get("/api/search/").status_code, 400)
+        self.assertEqual(self.client.get("/api/search/", {"q": "x", "country": "mars"}).status_code, 404)
+        self.assertEqual(self.client.get("/api/search/", {"q": "x", "page": 0}).status_code, 400)
+
+
+class SearchIndexTests(CountryTablesMixin, TestCase):
+    """copy_articles keeps the search index in step with the country tables."""
+
+    def sync(self):
+        return copy_articles({"usa": USANews, "india": IndiaNews}, {"usa": "Test", "india": "Test"})
+
+    def test_rewritten_articles_are_reindexed(self):
+        USANews.objects.create(**row("Harbour reopens", "https://example.com/harbour",
+                                     ["Ships returned after the storm."]))
+        self.sync()
+        self.assertEqual(self.titles("storm"), ["Harbour reopens"])
+
+        USANews.objects.filter(url_key="https://example.com/harbour").update(
+            **{k: v for k, v in row("Harbour closes", "https://example.com/harbour",
+                                    ["Fog stopped all traffic."]).items() if k != "tags"}
+        )
+        self.assertEqual(self.sync()["usa"], 1)
+        self.assertEqual(self.titles("storm"), [])
+        self.assertEqual(self.titles("harbour"), ["Harbour closes"])
+        self.assertEqual(self.titles("fog"), ["Harbour closes"])
+        self.assertEqual(Article.objects.count(), 1)
+
+    def test_deleted_articles_leave_the_index(self):
+        IndiaNews.objects.create(**row("Tea harvest", "https://example.in/tea", ["Record tea crop."]))
+        self.sync()
+        Article.objects.filter(title="Tea harvest").delete()
+        self.assertEqual(self.titles("tea"), [])
+
+    def titles(self, query):
+        return [r["title"] for r in search_articles(query, depth=None)[0]]
+
+
+# ----------------------------------------------------------------------
+# ARTICLE SYNC
+class CopyArticlesTests(CountryTablesMixin, TestCase):
+    """copy_articles / sync_countries from the country tables into Article."""
+
+    def sync(self):
+        return copy_articles({"usa": USANews, "india": IndiaNews}, {"usa": "Test", "india": "Test"})
+
+    def test_copies_rows_with_their_bodies(self):
+        USANews.objects.create(**row("Budget vote", "https://www.example.com/budget?ref=home",
+                                     ["First.", "Second."], tags=["Economy"]))
+        IndiaNews.objects.create(**row("Monsoon floods", "https://example.in/monsoon"))
+        self.assertEqual(self.sync(), {"usa": 1, "india": 1})
+
+        article = Article.objects.get(country="usa")
+        self.assertEqual(
+            (article.title, article.source, article.tags, article.link, article.url_key),
+            ("Budget vote", "Test", ["Economy"], "https://www.example.com/budget?ref=home",
+             canonical_url("https://www.example.com/budget?ref=home")),
+        )
+        self.assertEqual(ArticleBody.objects.get(article=article).text, "First.\n\nSecond.")
+
+    def test_rows_without_a_key_fall_back_to_the_link(self):
+        fields = row("Old row", "https://example.com/old")
+        USANews.objects.create(**{**fields, "url_key": None, "content_hash": None})
+        USANews.objects.create(**{**row("No link", "https://example.com/none"),
+                                  "url_key": None, "link": None})
+        self.assertEqual(self.sync()["usa"], 1)
+        article = Article.objects.get()
+        self.assertEqual(article.url_key, canonical_url("https://example.com/old"))
+        self.assertEqual(article.content_hash, fields["content_hash"])
+
+    def test_only_new_or_changed_rows_are_written(self):
+        for i in range(5):
+            USANews.objects.create(**row(f"Story {i}", f"https://example.com/{i}"))
+        self.assertEqual(self.sync()["usa"], 5)
+        self.assertEqual(self.sync()["usa"], 0)
+
+        # Tags change without the content (manage.py retag)
+        USANews.objects.filter(url_key="https://example.com/2").update(tags=["Weather"])
+        USANews.objects.create(**row("Story 5", "https://example.com/5"))
+        self.assertEqual(self.sync()["usa"], 2)
+        self.assertEqual(Article.objects.get(title="Story 2").tags, ["Weather"])
+        self.assertEqual(Article.objects.count(), 6)
+
+    def test_pages(self):
+        for i in range(7):
+            USANews.objects.create(**row(f"Story {i}", f"https://example.com/{i}"))
+        written = copy_articles({"usa": USANews}, {"usa": "Test"}, page_size=3)
+        self.assertEqual(written, {"usa": 7})
+        self.assertEqual(Article.objects.count(), 7)
+
+    def test_missing_tables_are_skipped(self):
+        self.assertEqual(copy_articles({"russia": RussiaNews}, {}), {"russia": 0})
+
+    def test_sync_countries_names_the_first_site(self):
+        IndiaNews.objects.create(**row("Monsoon floods", "https://example.in/monsoon"))
+        self.assertEqual(sync_countries(["india", "russia"]), {"india": 1, "russia": 0})
+        self.assertEqual(Article.objects.get().source, "NDTV India")
+
+
+class HasTagTests(CountryTablesMixin, TestCase):
+    """The tags__has_tag lookup (text[] on Postgres, JSON text elsewhere)."""
+
+    country_models = [USANews]
+
+    @classmethod
+    def setUpTestData(cls):
+        for title, tags in [("Both", ["Political", "Science & Tech"]), ("One", ["Political"]),
+                            ("Slash", ["Global/International"]), ("Quote", ['Say "hi"']),
+                            ("Empty", []), ("Null", None)]:
+            make_article(title, tags=tags or [])
+            USANews.objects.create(**{**row(title, f"https://example.com/{title}"), "tags": tags})
+
+    def titles(self, model, tag):
+        return sorted(model.objects.filter(tags__has_tag=tag).values_list(
+            "title" if model is Article else "url_key", flat=True))
+
+    def test_whole_tags_only(self):
+        self.assertEqual(self.titles(Article, "Political"), ["Both", "One"])
+        self.assertEqual(self.titles(Article, "Science & Tech"), ["Both"])
+        self.assertEqual(self.titles(Article, "Global/International"), ["Slash"])
+        self.assertEqual(self.titles(Article, 'Say "hi"'), ["Quote"])
+        for tag in ("Polit", "political", "Science", "", '"Political"'):
+            with self.subTest(tag=tag):
+                self.assertEqual(self.titles(Article, tag), [])
+
+    def test_country_tables(self):
+        self.assertEqual(self.titles(USANews, "Political"),
+                         ["https://example.com/Both", "https://example.com/One"])
+        self.assertEqual(self.titles(USANews, "Other"), [])
+
+
+# ----------------------------------------------------------------------
+# RETAG
+class RetagCommandTests(CountryTablesMixin, TestCase):
+    """manage.py retag writes back only the rows whose tags changed."""
+
+    def setUp(self):
+        tmp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmp)
+        self.stamp = os.path.join(tmp, "last_scrape.stamp")
+        # Keep the real tag cache out of it
+        patcher = mock.patch("news.management.commands.retag.TagCache",
+                             functools.partial(TagCache, os.path.join(tmp, "tag_cache.sqlite3")))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.stale = USANews.objects.create(**row(
+            "Senate vote", "https://example.com/senate",
+            ["The election campaign ended with a vote in the senate."], tags=["Sports"]))
+        self.current = USANews.objects.create(**row(
+            "Cup final", "https://example.com/cup",
+            ["The football team won the tournament match."], tags=["Sports"]))
+        self.untagged = USANews.objects.create(**row(
+            "Notice", "https://example.com/notice", ["Body."], tags=["Other"]))
+        copy_articles({"usa": USANews}, {"usa": "Test"})
+
+    def retag(self, *args):
+        out = StringIO()
+        with override_settings(NEWS_SCRAPE_STAMP=self.stamp):
+            call_command("retag", "--country", "usa", *args, stdout=out)
+        return out.getvalue()
+
+    def tags(self):
+        return dict(USANews.objects.values_list("id", "tags"))
+
+    def test_changed_tags_are_written(self):
+        output = self.retag()
+        self.assertIn("USA_news: 3 rows scanned, 1 updated", output)
+        self.assertEqual(self.tags(), {
+            self.stale.id: ["Political"],
+            self.current.id: ["Sports"],
+            self.untagged.id: ["Other"],
+        })
+        # Only the retagged row reaches Article, and the news API cache is invalidated
+        self.assertIn("Article: 1 articles updated", output)
+        self.assertEqual(Article.objects.get(title="Senate vote").tags, ["Political"])
+        self.assertTrue(os.path.exists(self.stamp))
+
+    def test_unchanged_rows_are_left_alone(self):
+        with mock.patch.object(USANews.objects, "bulk_update",
+                               wraps=USANews.objects.bulk_update) as bulk_update:
+            self.retag()
+        [(updated, fields), _] = bulk_update.call_args
+        self.assertEqual([r.id for r in updated], [self.stale.id])
+        self.assertEqual(fields, ["tags"])
+
+        # A second run finds nothing to do
+        output = self.retag()
+        self.assertIn("USA_news: 3 rows scanned, 0 updated", output)
+        self.assertNotIn("Article:", output)
+
+    def test_dry_run_writes_nothing(self):
+        before = self.tags()
+        output = self.retag("--dry-run")
+        self.assertIn("1 updated", output)
+        self.assertEqual(self.tags(), before)
+        self.assertFalse(os.path.exists(self.stamp))
@@ -1,9 +1,295 @@
+import base64
+import hashlib
+import json
+import os
+import threading
+from datetime import datetime
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Q
+from django.http import HttpResponse, HttpResponseNotModified, JsonResponse
 from django.shortcuts import render
-from django.http import HttpResponse
+
+from .models import ARTICLE_URL, COUNTRY_MODELS, Article, ArticleBody
+from .search import SEARCH_CANDIDATES, SEARCH_MAX_DEPTH, search_articles
 
 # Create your views here.
 def homepage(request):
     return render(request, 'frontend/main.html')
 
 def whodis(request):
-    return render(request, 'frontend/whodis.html')
\ No newline at end of file
+    return render(request, 'frontend/whodis.html')
+
+
+# ----------------------------------------------------------------------
+# NEWS API
+NEWS_PAGE_SIZE = 10
+NEWS_MAX_PAGE_SIZE = 50
+# Light columns only; the body comes from article_detail
+NEWS_FIELDS = ("id", "country", "source", "title", "scraped_at", "tags")
+
+
+def scrape_generation():
+    """
+    Changes every time a scrape run finishes (the orchestrator touches
+    settings.NEWS_SCRAPE_STAMP), so cached responses from before it stop matching.
+    """
+    try:
+        return os.stat(settings.NEWS_SCRAPE_STAMP).st_mtime_ns
+    except OSError:
+        return 0
+
+
+def encode_cursor(row):
+    raw = f"{row['scraped_at'].isoformat()}|{row['id']}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor):
+    """(scraped_at, id) of the last row on the previous page; ValueError if malformed."""
+    padded = cursor + "=" * (-len(cursor) % 4)
+    scraped_at, row_id = base64.urlsafe_b64decode(padded.encode()).decode().split("|")
+    return datetime.fromisoformat(scraped_at), int(row_id)
+
+
+def news_page(country=None, tag=None, cursor=None, limit=NEWS_PAGE_SIZE):
+    """
+    One page of articles, newest first, from one country or (None) all of them.
+
+    Keyset pagination on (scraped_at, id): each page continues after the last
+    row of the previous one, so deep pages cost the same as the first. The
+    (country, scraped_at, id) and tags indexes on Article serve these queries.
+
+    Returns:
+        tuple: (rows as dicts, cursor for the next page or None)
+    """
+    rows = Article.objects.order_by("-scraped_at", "-id")
+    if country:
+        rows = rows.filter(country=country)
+    if tag:
+        rows = rows.filter(tags__has_tag=tag)
+    if cursor:
+        scraped_at, row_id = cursor
+        rows = rows.filter(Q(scraped_at__lt=scraped_at) | Q(scraped_at=scraped_at, id__lt=row_id))
+
+    # One extra row tells us whether there is a next page
+    page = list(rows.values(*NEWS_FIELDS, url=ARTICLE_URL)[:limit + 1])
+    next_cursor = encode_cursor(page[limit - 1]) if len(page) > limit else None
+    return page[:limit], next_cursor
+
+
+def news_list(request, country):
+    """
+    GET /api/news/<country>/?tag=&cursor=&limit=
+
+    `country` is a key of COUNTRY_MODELS, or "all" for every country.
+
+    Responses are cached server-side until the next scrape run finishes
+    (or NEWS_API_CACHE_SECONDS pass), so repeat visits don't reach the database.
+    """
+    country = country.lower()
+    if country != "all" and country not in COUNTRY_MODELS:
+        return JsonResponse({"error": f"Unknown country: {country}"}, status=404)
+
+    tag = request.GET.get("tag") or None
+    cursor = request.GET.get("cursor") or None
+    try:
+        limit = min(int(request.GET.get("limit", NEWS_PAGE_SIZE)), NEWS_MAX_PAGE_SIZE)
+        position = decode_cursor(cursor) if cursor else None
+    except (TypeError, ValueError, UnicodeDecodeError):
+        return JsonResponse({"error": "Invalid limit or cursor"}, status=400)
+    if limit < 1:
+        return JsonResponse({"error": "Invalid limit or cursor"}, status=400)
+
+    key = f"news-api:{scrape_generation()}:{country}:{tag}:{cursor}:{limit}"
+    body = cache.get(key)
+    if body is None:
+        rows, next_cursor = news_page(None if country == "all" else country, tag, position, limit)
+        body = json.dumps(
+            {"country": country, "tag": tag, "results": rows, "next_cursor": next_cursor},
+            cls=DjangoJSONEncoder,
+        )
+        cache.set(key, body, settings.NEWS_API_CACHE_SECONDS)
+
+    response = HttpResponse(body, content_type="application/json")
+    response["Cache-Control"] = "public, max-age=60"
+    return response
+
+
+def news_search(request):
+    """
+    GET /api/search/?q=&country=&page=&limit=&depth=
+
+    Articles matching every word of `q` in their title or content, best match
+    first, one page at a time. Only the newest `depth` matches are ranked
+    (SEARCH_CANDIDATES by default, at most SEARCH_MAX_DEPTH); `truncated` is
+    true when there were more. Cached like news_list.
+    """
+    query = request.GET.get("q", "").strip()
+    country = (request.GET.get("country") or "").lower() or None
+    if not query:
+        return JsonResponse({"error": "Missing q"}, status=400)
+    if country and country not in COUNTRY_MODELS:
+        return JsonResponse({"error": f"Unknown country: {country}"}, status=404)
+    try:
+        limit = min(int(request.GET.get("limit", NEWS_PAGE_SIZE)), NEWS_MAX_PAGE_SIZE)
+        page = int(request.GET.get("page", 1))
+        depth = int(request.GET.get("depth", SEARCH_CANDIDATES))
+    except (TypeError, ValueError):
+        return JsonResponse({"error": "Invalid limit, page or depth"}, status=400)
+    if limit < 1 or page < 1 or not 1 <= depth <= SEARCH_MAX_DEPTH:
+        return JsonResponse({"error": "Invalid limit, page or depth"}, status=400)
+
+    # Hashed: cache keys can't hold spaces or arbitrary length
+    digest = hashlib.sha256(query.encode("utf-8")).hexdigest()[:32]
+    key = f"news-search:{scrape_generation()}:{country}:{page}:{limit}:{depth}:{digest}"
+    body = cache.get(key)
+    if body is None:
+        rows, has_more, truncated = search_articles(
+            query, country, limit, (page - 1) * limit, depth=depth
+        )
+        body = json.dumps(
+            {"query": query, "country": country, "page": page, "depth": depth,
+             "truncated": truncated, "results": rows,
+             "next_page": page + 1 if has_more else None},
+            cls=DjangoJSONEncoder,
+        )
+        cache.set(key, body, settings.NEWS_API_CACHE_SECONDS)
+
+    response = HttpResponse(body, content_type="application/json")
+    response["Cache-Control"] = "public, max-age=60"
+    return response
+
+
+def article_detail(request, article_id):
+    """
+    GET /api/articles/<id>/
+
+    One article with its body, decompressed from ArticleBody. Bodies change
+    only when a scrape rewrites them, so browsers may keep the response a while.
+    """
+    article = (
+        Article.objects.filter(id=article_id)
+        .values(*NEWS_FIELDS, "content_hash", url=ARTICLE_URL)
+        .first()
+    )
+    if article is None:
+        return JsonResponse({"error": f"No article {article_id}"}, status=404)
+
+    body = ArticleBody.objects.filter(article_id=article_id).first()
+    article["content"] = body.text if body else ""
+
+    response = JsonResponse(article)
+    response["Cache-Control"] = "public, max-age=300"
+    return response
+
+
+# ----------------------------------------------------------------------
+# GLOBE SNAPSHOT
+# Files written by news/Functionality/snapshot.py at the end of each scrape run.
+# Kept in memory and reloaded only when globe.etag changes.
+SNAPSHOT_ENCODINGS = [("br", "globe.json.br"), ("gzip", "globe.json.gz")]
+_snapshot = {"stamp": None, "etag": None, "bodies": {}}
+_snapshot_lock = threading.Lock()
+
+
+def load_snapshot():
+    """(etag, {encoding: bytes}) of the current snapshot; (None, {}) if there is none."""
+    directory = settings.GLOBE_SNAPSHOT_DIR
+    try:
+        stat = os.stat(os.path.join(directory, "globe.etag"))
+    except OSError:
+        return None, {}
+    stamp = (stat.st_mtime_ns, stat.st_size)
+
+    with _snapshot_lock:
+        if _snapshot["stamp"] != stamp:
+            bodies = {}
+            for encoding, name in SNAPSHOT_ENCODINGS + [("identity", "globe.json")]:
+                try:
+                    with open(os.path.join(directory, name), "rb") as f:
+                        bodies[encoding] = f.read()
+                except OSError:
+                    continue
+            with open(os.path.join(directory, "globe.etag")) as f:
+                etag = f.read().strip()
+            _snapshot.update(stamp=stamp, etag=etag, bodies=bodies)
+        return _snapshot["etag"], _snapshot["bodies"]
+
+
+def accepted_encodings(header):
+    """
+    {coding: q} from an Accept-Encoding header, codings lower-cased. A coding
+    without a q-value has q=1; one with a malformed q-value is not accepted.
+    """
+    accepted = {}
+    for item in header.split(","):
+        coding, *params = [part.strip() for part in item.split(";")]
+        if not coding:
+            continue
+        q = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        accepted[coding.lower()] = q
+    return accepted
+
+
+def negotiate_encoding(header, available):
+    """
+    The coding of `available` (most preferred first) the client rates
+    highest, or None if it accepts none of them.
+
+    Unlisted codings get the q of "*" if present; otherwise identity is
+    still acceptable, as the last resort, and any other coding isn't.
+    """
+    accepted = accepted_encodings(header)
+
+    def quality(coding):
+        if coding in accepted:
+            return accepted[coding]
+        if "*" in accepted:
+            return accepted["*"]
+        return 0.001 if coding == "identity" else 0.0  # lowest q there is
+
+    best = max(available, key=quality)  # first of the best, so in preference order
+    return best if quality(best) > 0 else None
+
+
+def globe_snapshot(request):
+    """
+    GET /api/globe/
+
+    Per-country article counts, top tags and latest headlines, precomputed at
+    the end of each scrape run. Sent pre-compressed, with 304 Not Modified for
+    a matching If-None-Match.
+    """
+    etag, bodies = load_snapshot()
+    if "identity" not in bodies:
+        return JsonResponse({"error": "No globe snapshot yet"}, status=503)
+
+    quoted = f'"{etag}"'
+    if quoted in [t.strip() for t in request.headers.get("If-None-Match", "").split(",")]:
+        response = HttpResponseNotModified()
+    else:
+        encoding = negotiate_encoding(
+            request.headers.get("Accept-Encoding", ""),
+            [e for e, _ in SNAPSHOT_ENCODINGS if e in bodies] + ["identity"],
+        )
+        if encoding is None:
+            return JsonResponse({"error": "No acceptable Content-Encoding"}, status=406)
+        response = HttpResponse(bodies[encoding], content_type="application/json")
+        if encoding != "identity":
+            response["Content-Encoding"] = encoding
+
+    response["ETag"] = quoted
+    response["Vary"] = "Accept-Encoding"
+    # Always revalidate; an unchanged snapshot costs a 304
+    response["Cache-Control"] = "no-cache"
+    return response